@@ -0,0 +1,137 @@
+__author__ = 'Guillermo Rodolfo Ellison'
+
+# Writes the benchmark corpus under benchmarks/fixtures/<from_lang><to_lang>/<word>.html.gz.
+#
+# The pages are synthetic: they reproduce the wordreference markup the cleaning and the parser depend on (the
+# articleWRD table, wrtopsection rows, FrWrd/ToWrd/POS2/Fr2/dsense/FrEx/ToEx/tooltip cells, mixed quotes, spaced '=',
+# <strong>, &nbsp;, arrows, the collinsdiv marker and the page around it) with a fixed seed per page, because pages
+# cannot be recorded from the build hosts. Recorded pages saved with the same layout are picked up by
+# run_benchmarks.py like these ones.
+
+import gzip
+import os
+import random
+
+CONST_FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+# (from_lang, to_lang, word, sections, entries per section)
+CONST_FIXTURE_PAGES = [
+    ('es', 'en', 'casa', 3, 30),
+    ('es', 'en', 'jardín', 1, 4),
+    ('en', 'es', 'house', 4, 40),
+    ('en', 'it', 'after', 4, 150),
+    ('en', 'fr', 'set', 4, 90),
+    ('fr', 'en', 'être', 2, 8),
+]
+CONST_WORDS = ['casa', 'jardín', 'niño', 'acción', 'über', 'façade', 'après', 'città', 'house', 'après-ski', 'naïve',
+               'cañón', 'öl', 'être', 'garçon', 'árbol', 'perché', 'déjà vu', 'smörgåsbord', 'piñata', 'after',
+               'dopo', 'set', 'ensemble']
+CONST_GRAMMARS = ['n', 'nf', 'nm', 'vtr', 'vi', 'adj', 'adv', 'prep', 'conj', 'nmpl']
+CONST_NOTES = ['informal', 'formal', 'UK', 'US', 'slang', 'figurative']
+CONST_SECTIONS = [('sMainMeanings', 'Principal Translations'), ('sAddTrans', 'Additional Translations'),
+                  ('sCmpdForms', 'Compound Forms'), ('sPhrasalVerbs', 'Phrasal verbs')]
+
+
+def quote(rnd: random.Random, value: str) -> str:
+    return f"'{value}'" if rnd.random() < 0.7 else f'"{value}"'
+
+
+def equals(rnd: random.Random) -> str:
+    return rnd.choice(['=', '=', '=', ' = ', ' =', '= '])
+
+
+def new_word(rnd: random.Random) -> str:
+    word: str = rnd.choice(CONST_WORDS)
+    if rnd.random() < 0.3:
+        word += ' ' + rnd.choice(CONST_WORDS)
+    return word
+
+
+def new_sentence(rnd: random.Random) -> str:
+    return ' '.join(rnd.choice(CONST_WORDS + ['la', 'de', 'the', 'a', 'with', 'y', 'con'])
+                    for _ in range(rnd.randint(3, 14))) + '.'
+
+
+def append_entry(rnd: random.Random, lines: [str], lang_pair: str, entry_ind: int):
+    row: str = quote(rnd, rnd.choice(['even', 'odd']))
+    from_word: str = new_word(rnd)
+    from_word_html: str = from_word if rnd.random() < 0.5 else f'<strong>{from_word}</strong>'
+    if rnd.random() < 0.2:
+        from_word_html = f"<a href='/x/{from_word}'></a>" + from_word_html
+    tone: str = f"<span class{equals(rnd)}'Fr2'>{rnd.choice(CONST_NOTES)}</span> " if rnd.random() < 0.3 else ''
+    context: str = ''
+    if rnd.random() < 0.7:
+        context = f"(<span title{equals(rnd)}'{new_sentence(rnd)}'>{rnd.choice(CONST_WORDS)}</span>, " \
+                  f"{rnd.choice(CONST_WORDS)})"
+        if rnd.random() < 0.2:
+            context = rnd.choice(CONST_NOTES) + ' (' + rnd.choice(CONST_WORDS) + ')'
+        if rnd.random() < 0.15:
+            context = f"({rnd.choice(CONST_WORDS)})({rnd.choice(CONST_NOTES)})"
+    tag: str = rnd.choice(['em', 'i'])
+    grammar: str = f"<{tag} class{equals(rnd)}{quote(rnd, 'POS2')}>{rnd.choice(CONST_GRAMMARS)}</{tag}>"
+    if rnd.random() < 0.2:
+        grammar = f"<{tag} class{equals(rnd)}{quote(rnd, 'POS2')}>{rnd.choice(CONST_GRAMMARS)}" \
+                  f"<span><i>grammar</i>: note</span></{tag}>"
+    if rnd.random() < 0.1:
+        grammar = f"<{tag} class={quote(rnd, 'POS2')}></{tag}>"
+    arrow: str = ' ⇒' if rnd.random() < 0.3 else ''
+    td: str = 'TD' if rnd.random() < 0.1 else 'td'
+    lines.append(f"<tr class={row} id='{lang_pair}:{entry_ind}'><{td} class={quote(rnd, 'FrWrd')}>{from_word_html} "
+                 f"{grammar}{arrow}</td><td> {tone}{context} ⓘ</td><td class={quote(rnd, 'ToWrd')}>{new_word(rnd)} "
+                 f"<em class={quote(rnd, 'POS2')}>{rnd.choice(CONST_GRAMMARS)}</em></td></tr>")
+    for _ in range(rnd.randint(0, 3)):
+        note: str = f"<span class='dsense'>({rnd.choice(CONST_NOTES)})</span>" if rnd.random() < 0.5 else ''
+        lines.append(f"<tr class={row}><td>&nbsp;</td><td> {note}</td><td class={quote(rnd, 'ToWrd')}>"
+                     f"<a href='/y'></a>{new_word(rnd)}  <em class={quote(rnd, 'POS2')}>"
+                     f"{rnd.choice(CONST_GRAMMARS)}</em></td></tr>")
+    for _ in range(rnd.randint(0, 2)):
+        lines.append(f"<tr class={row}><td>&nbsp;</td><td colspan=2 class='FrEx'><span dir='ltr'>"
+                     f"{new_sentence(rnd)}</span></td></tr>")
+    for _ in range(rnd.randint(0, 2)):
+        if rnd.random() < 0.3:
+            lines.append(f"<tr class={row}><td>&nbsp;</td><td colspan=2 class='ToEx'><span class='tooltip'>"
+                         f"{new_sentence(rnd)}</span> ({rnd.choice(CONST_WORDS)}) rest</td></tr>")
+        else:
+            lines.append(f"<tr class={row}><td>&nbsp;</td><td colspan=2 class='ToEx'><span dir='ltr'>"
+                         f"{new_sentence(rnd)}</span> <a href='z'>link</a> more text</td></tr>")
+
+
+def new_page(from_lang: str, to_lang: str, word: str, sections: int, entries: int) -> str:
+    rnd: random.Random = random.Random(f'{from_lang}{to_lang}/{word}')
+    lines: [str] = [
+        f'<!DOCTYPE html><html><head><title>{word} - WordReference</title>',
+        '<script>var a = "articleWR" + "D"; if (a  >  1) {}</script>' * 20,
+        '<link href="/style.css" rel="stylesheet"></head><body>',
+        '<div class="nav">' + ('<a href="/x">menu</a>  &nbsp; ' * 50) + '</div>',
+        f"<div id={quote(rnd, 'articleWRD')}><table class='WRD' data-dict='WRD'>"]
+    entry_ind: int = 0
+    for data_ph, title in CONST_SECTIONS[:sections]:
+        lines.append(f"<tr class={quote(rnd, 'wrtopsection')} data-ph='{data_ph}'><td colspan='3' title='{title}'>"
+                     f"<span class='ph' data-ph='{data_ph}'>{title}</span></td></tr>")
+        lines.append(f"<tr class='langHeader'><td class='FrWrd'><span class='ph' data-ph='sLang_{from_lang}'>"
+                     f"{from_lang}</span></td><td></td><td class='ToWrd'><span class='ph' "
+                     f"data-ph='sLang_{to_lang}'>{to_lang}</span></td></tr>")
+        for _ in range(entries):
+            entry_ind += 1
+            append_entry(rnd, lines, from_lang + to_lang, entry_ind)
+    lines.append('</table></div>')
+    lines.append(f'<div id{equals(rnd)}"collinsdiv"><h3>Collins</h3>' +
+                 ('<p class="x">collins  text &nbsp; <strong>b</strong></p>' * 400) + '</div>')
+    lines.append('<footer>' + 'footer ' * 500 + '</footer></body></html>')
+    return '\n'.join(lines)
+
+
+def write_fixtures(fixtures_dir: str = CONST_FIXTURES_DIR) -> [str]:
+    paths: [str] = []
+    for from_lang, to_lang, word, sections, entries in CONST_FIXTURE_PAGES:
+        path: str = os.path.join(fixtures_dir, from_lang + to_lang, word + '.html.gz')
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # mtime=0 keeps the files byte for byte the same across runs
+        with gzip.GzipFile(path, 'wb', mtime=0) as file:
+            file.write(new_page(from_lang, to_lang, word, sections, entries).encode('utf-8'))
+        paths.append(path)
+    return paths
+
+
+if __name__ == '__main__':
+    for fixture_path in write_fixtures():
+        print(fixture_path)
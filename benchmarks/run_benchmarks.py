@@ -0,0 +1,141 @@
+__author__ = 'Guillermo Rodolfo Ellison'
+
+# Times every stage of the pipeline on the pages under benchmarks/fixtures (see generate_fixtures.py) and writes the
+# results as json. With --baseline, the stages that got slower than a previous result by more than --threshold are
+# listed and the exit status is 1.
+
+import argparse
+import gzip
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from translation_as_console_table import retrieve_console_table
+from translation_bulk import iter_corpus_pages, parse_page_name
+from word_translator_client import ParserState, Translation, clean_html, get_parser_backend, iter_translation_tags, \
+    next_tag_content, parse_translation_html
+
+CONST_FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+CONST_STAGES = ['clean_html', 'tokenize', 'tokenize_next_tag_content', 'state_machine', 'parse_translation_html',
+                'to_json_encoded', 'to_json_decoded', 'to_dict_decoded', 'retrieve_console_table']
+
+
+def tokenize_next_tag_content(html: str) -> int:
+    # the original tokenizer, which copies the rest of the page after every tag
+    count: int = 0
+    rest, classes, data_phs, content = next_tag_content(html)
+    while rest:
+        count += 1
+        rest, classes, data_phs, content = next_tag_content(rest)
+    return count
+
+
+def run_state_machine(tag_contents: list, from_lang: str, to_lang: str, word: str) -> Translation:
+    translation: Translation = Translation(from_lang=from_lang, to_lang=to_lang, from_word=word, entry_sections=[])
+    work: ParserState = ParserState('', False, False, False)
+    work.tags = iter(tag_contents)
+    for _ in iter_translation_tags(translation, work):
+        pass
+    return translation
+
+
+def time_stage(function, repeat: int) -> dict:
+    seconds: [float] = []
+    for _ in range(repeat):
+        start: float = time.perf_counter()
+        function()
+        seconds.append(time.perf_counter() - start)
+    return {'min': min(seconds), 'median': statistics.median(seconds), 'repeat': repeat}
+
+
+def benchmark_page(html: str, from_lang: str, to_lang: str, word: str, repeat: int, backend: str) -> dict:
+    iter_tag_contents = get_parser_backend(backend)
+    cleaned: str = clean_html(html)
+    tag_contents: list = list(iter_tag_contents(cleaned))
+    translation: Translation = parse_translation_html(html, from_lang, to_lang, word, backend=backend)
+    stage_functions: dict = {
+        'clean_html': lambda: clean_html(html),
+        'tokenize': lambda: list(iter_tag_contents(cleaned)),
+        'tokenize_next_tag_content': lambda: tokenize_next_tag_content(cleaned),
+        'state_machine': lambda: run_state_machine(tag_contents, from_lang, to_lang, word),
+        'parse_translation_html': lambda: parse_translation_html(html, from_lang, to_lang, word, backend=backend),
+        'to_json_encoded': lambda: translation.to_json_encoded(),
+        'to_json_decoded': lambda: translation.to_json_decoded(),
+        'to_dict_decoded': lambda: translation.to_dict_decoded(),
+        'retrieve_console_table': lambda: retrieve_console_table(translation),
+    }
+    return {
+        'html_chars': len(html),
+        'cleaned_chars': len(cleaned),
+        'tags': len(tag_contents),
+        'sections': len(translation.entry_sections),
+        'entry_words': sum(len(entry_section.entry_words) for entry_section in translation.entry_sections),
+        'stages': {stage: time_stage(stage_functions[stage], repeat) for stage in CONST_STAGES}
+    }
+
+
+def run_benchmarks(fixtures_dir: str = CONST_FIXTURES_DIR, repeat: int = 5, backend: str = 'python') -> dict:
+    pages: dict = {}
+    for name, data in iter_corpus_pages(fixtures_dir):
+        from_lang, to_lang, word = parse_page_name(name)
+        if name.lower().endswith('.gz'):
+            data = gzip.decompress(data)
+        pages[f'{from_lang}{to_lang}/{word}'] = benchmark_page(data.decode('utf-8'), from_lang, to_lang, word,
+                                                               repeat, backend)
+    return {
+        'python': platform.python_version(),
+        'implementation': platform.python_implementation(),
+        'machine': platform.machine(),
+        'backend': backend,
+        'pages': pages,
+        'totals': {stage: sum(page['stages'][stage]['min'] for page in pages.values()) for stage in CONST_STAGES}
+    }
+
+
+def find_regressions(results: dict, baseline: dict, threshold: float) -> [str]:
+    # per page and stage, compared on the minimum time
+    regressions: [str] = []
+    for page_name, page in results['pages'].items():
+        baseline_page: dict | None = baseline['pages'].get(page_name)
+        if baseline_page is None:
+            continue
+        for stage, stage_result in page['stages'].items():
+            baseline_stage: dict | None = baseline_page['stages'].get(stage)
+            if baseline_stage is not None and stage_result['min'] > baseline_stage['min'] * (1 + threshold):
+                regressions.append(f"{page_name} {stage}: {baseline_stage['min'] * 1000:.3f} ms -> "
+                                   f"{stage_result['min'] * 1000:.3f} ms")
+    return regressions
+
+
+def main(argv: list | None = None) -> int:
+    parser: argparse.ArgumentParser = argparse.ArgumentParser(description='time the parsing pipeline stages')
+    parser.add_argument('--fixtures', default=CONST_FIXTURES_DIR, help='directory of <from><to>/<word>.html[.gz]')
+    parser.add_argument('--repeat', type=int, default=5, help='runs per stage, the minimum and median are kept')
+    parser.add_argument('--backend', default='python', help='parser backend for the tokenize and parse stages')
+    parser.add_argument('--output', help='json file for the results, stdout by default')
+    parser.add_argument('--baseline', help='json results of a previous run to compare with')
+    parser.add_argument('--threshold', type=float, default=0.2, help='slowdown reported as a regression')
+    args = parser.parse_args(argv)
+    results: dict = run_benchmarks(args.fixtures, args.repeat, args.backend)
+    text: str = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, 'w') as file:
+            file.write(text)
+    else:
+        print(text)
+    if args.baseline:
+        with open(args.baseline) as file:
+            regressions: [str] = find_regressions(results, json.load(file), args.threshold)
+        for regression in regressions:
+            print(regression, file=sys.stderr)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -16,5 +16,9 @@ setup(
     long_description=open('README.md', encoding='utf-8').read(),
     long_description_content_type='text/markdown',
     packages=find_packages(),
-    py_modules=['setup', 'word_translator_client', 'translation_as_console_table']
+    py_modules=['setup', 'word_translator_client', 'translation_as_console_table', 'word_translator_async',
+                'translation_cache', 'translation_bulk', 'translation_pack',
+                'translation_index', 'word_translator_cli'],
+    extras_require={'async': ['aiohttp']},
+    entry_points={'console_scripts': ['word-translator = word_translator_cli:main']}
 )
@@ -0,0 +1,80 @@
+__author__ = 'Guillermo Rodolfo Ellison'
+
+import gzip
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from word_translator_client import HtmlTrimmer, Translation, iter_entry_sections, parse_translation_html, \
+    parser_backends
+
+CONST_FIXTURES_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'benchmarks',
+                                  'fixtures')
+# the json of the benchmark fixtures as written by the first version of the parser, which fetched and cleaned the page
+# with the original string slicing code; every rewrite of the cleaning, the tokenizer and the parser must give it back
+CONST_GOLDEN_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'golden')
+
+
+def read_gzip_text(path: str) -> str:
+    with gzip.open(path, 'rt', encoding='utf-8') as file:
+        return file.read()
+
+
+def iter_fixture_pages():
+    # (from_lang, to_lang, word, html) of every fixture page
+    for lang_pair in sorted(os.listdir(CONST_FIXTURES_DIR)):
+        for file_name in sorted(os.listdir(os.path.join(CONST_FIXTURES_DIR, lang_pair))):
+            yield lang_pair[:2], lang_pair[2:], file_name[:-len('.html.gz')], \
+                read_gzip_text(os.path.join(CONST_FIXTURES_DIR, lang_pair, file_name))
+
+
+def trim_html_in_chunks(html: str, chunk_size: int) -> str:
+    trimmer: HtmlTrimmer = HtmlTrimmer()
+    for start in range(0, len(html), chunk_size):
+        if trimmer.feed(html[start:start + chunk_size]):
+            break
+    return trimmer.get_html()
+
+
+class ParserGoldenTest(unittest.TestCase):
+    def setUp(self):
+        self.pages: list = list(iter_fixture_pages())
+        self.assertTrue(self.pages)
+
+    def assert_golden(self, translation: Translation, from_lang: str, to_lang: str, word: str):
+        golden_path: str = os.path.join(CONST_GOLDEN_DIR, f'{from_lang}{to_lang}', word)
+        self.assertEqual(read_gzip_text(golden_path + '.encoded.json.gz'), translation.to_json_encoded())
+        self.assertEqual(read_gzip_text(golden_path + '.decoded.json.gz'), translation.to_json_decoded())
+
+    def test_every_backend(self):
+        for backend in parser_backends:
+            for from_lang, to_lang, word, html in self.pages:
+                with self.subTest(backend=backend, page=f'{from_lang}{to_lang}/{word}'):
+                    self.assert_golden(parse_translation_html(html, from_lang, to_lang, word, backend=backend),
+                                       from_lang, to_lang, word)
+
+    def test_trimmed_pages(self):
+        for chunk_size in (997, 16384):
+            for from_lang, to_lang, word, html in self.pages:
+                with self.subTest(chunk_size=chunk_size, page=f'{from_lang}{to_lang}/{word}'):
+                    self.assert_golden(parse_translation_html(trim_html_in_chunks(html, chunk_size), from_lang,
+                                                              to_lang, word), from_lang, to_lang, word)
+
+    def test_streamed_entry_sections(self):
+        for from_lang, to_lang, word, html in self.pages:
+            with self.subTest(page=f'{from_lang}{to_lang}/{word}'):
+                translation: Translation = Translation(from_lang, to_lang, word,
+                                                       list(iter_entry_sections(html, from_lang, to_lang, word)))
+                self.assert_golden(translation, from_lang, to_lang, word)
+
+    def test_binary_records(self):
+        for from_lang, to_lang, word, html in self.pages:
+            with self.subTest(page=f'{from_lang}{to_lang}/{word}'):
+                translation: Translation = parse_translation_html(html, from_lang, to_lang, word)
+                self.assert_golden(Translation.from_bytes(translation.to_bytes()), from_lang, to_lang, word)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,59 @@
+__author__ = 'Guillermo Rodolfo Ellison'
+
+import gzip
+import io
+import json
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from translation_bulk import iter_corpus_entries, iter_corpus_pages, parse_page_name, reparse_corpus
+from word_translator_client import parse_translation_html
+
+CONST_FIXTURES_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'benchmarks',
+                                  'fixtures')
+
+
+class ReparseCorpusTest(unittest.TestCase):
+    def setUp(self):
+        self.dir: tempfile.TemporaryDirectory = tempfile.TemporaryDirectory()
+        self.expected: [str] = []
+        for name, data in iter_corpus_pages(CONST_FIXTURES_DIR):
+            from_lang, to_lang, word = parse_page_name(name)
+            self.expected.append(
+                parse_translation_html(gzip.decompress(data), from_lang, to_lang, word).to_json_encoded(None))
+
+    def tearDown(self):
+        self.dir.cleanup()
+
+    def test_directory_pages_by_path(self):
+        entries: list = list(iter_corpus_entries(CONST_FIXTURES_DIR))
+        self.assertTrue(entries)
+        for name, path, data in entries:
+            self.assertIsNone(data)
+            self.assertTrue(os.path.isfile(path))
+
+    def test_directory_and_archive(self):
+        archive: str = shutil.make_archive(os.path.join(self.dir.name, 'fixtures'), 'zip', CONST_FIXTURES_DIR)
+        for source in (CONST_FIXTURES_DIR, archive):
+            with self.subTest(source=source):
+                output: io.StringIO = io.StringIO()
+                self.assertEqual(len(self.expected), reparse_corpus(source, output, workers=2, chunksize=2))
+                self.assertEqual(sorted(self.expected), sorted(output.getvalue().splitlines()))
+
+    def test_unreadable_page(self):
+        os.makedirs(os.path.join(self.dir.name, 'esen'))
+        os.symlink(os.path.join(self.dir.name, 'missing'), os.path.join(self.dir.name, 'esen', 'casa.html'))
+        output: io.StringIO = io.StringIO()
+        self.assertEqual(1, reparse_corpus(self.dir.name, output, workers=1))
+        record: dict = json.loads(output.getvalue())
+        self.assertEqual(('es', 'en', 'casa'), (record['from_lang'], record['to_lang'], record['from_word']))
+        self.assertTrue(record['error'].startswith('FileNotFoundError'))
+
+
+if __name__ == '__main__':
+    unittest.main()
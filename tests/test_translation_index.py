@@ -0,0 +1,50 @@
+__author__ = 'Guillermo Rodolfo Ellison'
+
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from translation_index import ReverseIndex
+from word_translator_client import EntrySection, EntryWord, FromWord, ToWord, Translation
+
+
+def new_translation(word: str, to_words: [str], example: str = '') -> Translation:
+    return Translation('es', 'en', word, [EntrySection('principal_translations', [
+        EntryWord(FromWord(word, 'nf'), [ToWord(to_word, 'n', '') for to_word in to_words], '', '',
+                  [example] if example else [], [])])])
+
+
+class ReverseIndexTest(unittest.TestCase):
+    def test_replaced_translations(self):
+        index: ReverseIndex = ReverseIndex(index_examples=True)
+        index.add(new_translation('hogar', ['home']))
+        for ind in range(100):
+            index.add(new_translation('casa', [f'house {ind}', 'home'], f'example {ind}'))
+        self.assertEqual(['hogar', 'casa'], index.get_source_words('home'))
+        self.assertEqual(1, len(index.lookup('house 99')))
+        self.assertEqual([], index.lookup('house 98'))
+        self.assertEqual(1, len(index.lookup('99', field='example')))
+        self.assertEqual([], index.lookup('98', field='example'))
+        stats: dict = index.get_stats()
+        self.assertEqual(2, stats['translations'])
+        # the replaced postings are dropped once they are half of all of them, so they never pile up
+        self.assertLessEqual(stats['postings']['to_word'] + stats['postings']['example'], 2 * (1 + 4))
+        self.assertLessEqual(len(index.translations), 4)
+        self.assertNotIn('house 0', index.postings['to_word'])
+
+    def test_hits_after_compacting(self):
+        index: ReverseIndex = ReverseIndex(index_from_words=True)
+        for word in ('casa', 'hogar', 'vivienda'):
+            index.add(new_translation(word, ['home', word + ' en']))
+        for _ in range(3):
+            index.add(new_translation('casa', ['home', 'house']))
+        self.assertEqual(['hogar', 'vivienda', 'casa'], index.get_source_words('home'))
+        self.assertEqual(['casa'], index.get_source_words('house'))
+        self.assertEqual([], index.lookup('casa en'))
+        self.assertEqual('vivienda', index.lookup('vivienda', field='from_word')[0].translation.from_word)
+
+
+if __name__ == '__main__':
+    unittest.main()
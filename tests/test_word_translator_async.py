@@ -0,0 +1,55 @@
+__author__ = 'Guillermo Rodolfo Ellison'
+
+import gzip
+import os
+import socket
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+try:
+    from aiohttp import web
+except ImportError:
+    web = None
+
+from word_translator_async import AsyncTranslatorClient
+from word_translator_client import parse_translation_html
+
+CONST_PAGE_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'benchmarks', 'fixtures',
+                               'esen', 'casa.html.gz')
+
+
+@unittest.skipIf(web is None, 'aiohttp is not installed')
+class AsyncTranslatorClientTest(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        with open(CONST_PAGE_PATH, 'rb') as file:
+            self.page: bytes = gzip.decompress(file.read())
+
+        async def handle(request: 'web.Request') -> 'web.Response':
+            # a Content-Type without charset, so aiohttp cannot tell the encoding before the body is read
+            return web.Response(body=self.page, headers={'Content-Type': 'text/html'})
+
+        app: web.Application = web.Application()
+        app.router.add_get('/{lang_pair}/{word}', handle)
+        self.runner: web.AppRunner = web.AppRunner(app)
+        await self.runner.setup()
+        sock: socket.socket = socket.socket()
+        sock.bind(('127.0.0.1', 0))
+        await web.SockSite(self.runner, sock).start()
+        self.base_url: str = f'http://127.0.0.1:{sock.getsockname()[1]}'
+
+    async def asyncTearDown(self):
+        await self.runner.cleanup()
+
+    async def test_page_without_charset(self):
+        expected: str = parse_translation_html(self.page, 'es', 'en', 'casa').to_json_encoded()
+        for early_cutoff in (True, False):
+            async with AsyncTranslatorClient(base_url=self.base_url, max_retries=0,
+                                             early_cutoff=early_cutoff) as client:
+                translation = await client.retrieve_translation('es', 'en', 'casa')
+            self.assertEqual(expected, translation.to_json_encoded())
+
+
+if __name__ == '__main__':
+    unittest.main()
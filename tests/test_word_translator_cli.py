@@ -0,0 +1,93 @@
+__author__ = 'Guillermo Rodolfo Ellison'
+
+import gc
+import gzip
+import json
+import os
+import sys
+import tempfile
+import threading
+import unittest
+import warnings
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import unquote
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from word_translator_cli import main, parse_word_line
+from word_translator_client import parse_translation_html
+
+CONST_FIXTURES_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'benchmarks',
+                                  'fixtures')
+
+
+class FixtureHandler(BaseHTTPRequestHandler):
+    # /<from_lang><to_lang>/<word> gives the fixture page of that word, 404 for the rest
+    def do_GET(self):
+        path: str = os.path.join(CONST_FIXTURES_DIR, *unquote(self.path).strip('/').split('/')) + '.html.gz'
+        if not os.path.isfile(path):
+            self.send_error(404)
+            return
+        with open(path, 'rb') as file:
+            page: bytes = gzip.decompress(file.read())
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(page)))
+        self.end_headers()
+        self.wfile.write(page)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class WordTranslatorCliTest(unittest.TestCase):
+    def setUp(self):
+        self.server: ThreadingHTTPServer = ThreadingHTTPServer(('127.0.0.1', 0), FixtureHandler)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.base_url: str = f'http://127.0.0.1:{self.server.server_address[1]}'
+        self.dir: tempfile.TemporaryDirectory = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+        self.dir.cleanup()
+
+    def write_words(self, text: str) -> str:
+        path: str = os.path.join(self.dir.name, 'words.txt')
+        with open(path, 'w', encoding='utf-8') as file:
+            file.write(text)
+        return path
+
+    def test_base_url(self):
+        output: str = os.path.join(self.dir.name, 'out.jsonl')
+        status: int = main([self.write_words('esen/casa\nen\tes\thouse\n'), '--output', output, '--ordered',
+                            '--base-url', self.base_url, '--connect-timeout', '2', '--read-timeout', '5'])
+        self.assertEqual(0, status)
+        with open(output, encoding='utf-8') as file:
+            records: [dict] = [json.loads(line) for line in file]
+        with gzip.open(os.path.join(CONST_FIXTURES_DIR, 'esen', 'casa.html.gz'), 'rt', encoding='utf-8') as file:
+            expected: dict = json.loads(parse_translation_html(file.read(), 'es', 'en', 'casa').to_json_encoded())
+        self.assertEqual(expected, records[0])
+        self.assertEqual(('en', 'es', 'house'), (records[1]['from_lang'], records[1]['to_lang'],
+                                                 records[1]['from_word']))
+
+    def test_two_tab_fields(self):
+        with self.assertRaises(ValueError):
+            parse_word_line('es\tcasa', None, None)
+        with self.assertRaises(ValueError):
+            parse_word_line('casa\tgrande', 'es', 'en')
+
+    def test_missing_pack(self):
+        output: str = os.path.join(self.dir.name, 'out.jsonl')
+        # the words and the output opened before the pack are closed, not left to the garbage collector
+        with warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter('always', ResourceWarning)
+            with self.assertRaises(FileNotFoundError):
+                main([self.write_words('esen/casa\n'), '--output', output, '--base-url', self.base_url,
+                      '--pack', os.path.join(self.dir.name, 'missing.pack')])
+            gc.collect()
+        self.assertEqual([], [warning for warning in caught if issubclass(warning.category, ResourceWarning)])
+
+
+if __name__ == '__main__':
+    unittest.main()
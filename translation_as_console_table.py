@@ -1,5 +1,14 @@
+import io
+import shutil
+import textwrap
+
 from word_translator_client import Translation, EntrySection, EntryWord, ToWord, retrieve_translation
 
+# the share of the entry row columns in a table of bounded width, and the columns taking what the rounding leaves
+CONST_BOUNDED_WEIGHTS = {'from_word': 17, 'from_grammar': 8, 'tone': 7, 'context': 19, 'to_word': 21, 'to_grammar': 8,
+                         'note': 10}
+CONST_BOUNDED_SPARE_COLUMNS = ['to_word', 'context', 'from_word', 'note']
+
 
 class AllLengths:
     def __init__(self):
@@ -70,10 +79,7 @@ def retrieve_all_lengths(translation: Translation) -> AllLengths:
 
 
 def get_spaces(s: str, max_len: int) -> str:
-    space: str = ''
-    for _ in range(max_len - len(s)):
-        space += ' '
-    return space
+    return ' ' * (max_len - len(s))
 
 
 def replace_for_col_sep(s: str, col_sep: str, all_lenths: AllLengths) -> str:
@@ -89,84 +95,94 @@ def replace_for_col_sep(s: str, col_sep: str, all_lenths: AllLengths) -> str:
         s[pos_5 + 1:]
 
 
+class TableFrame:
+    # the separators, the separator lines and the padding of the empty cells of a table with the given lengths,
+    # computed once per table
+    def __init__(self, all_lenths: AllLengths):
+        self.nl: str = '\n'
+        row_sep = '\u2500'
+        col_sep = '\u2502'
+        self.nc: str = f' {col_sep} '
+        self.sl: str = f'{col_sep} '
+        self.el: str = f' {col_sep}'
+        t_sep: str = '\u252c'
+        inv_t_sep: str = '\u2534'
+        max_row_len: int = all_lenths.get_max_row_len(self.nc, self.sl, self.el)
+        self.row_len: int = max_row_len - len(self.el)
+        self.nr: str = '\u251c' + row_sep * (max_row_len - 2) + '\u2524' + self.nl
+        self.t_nr: str = replace_for_col_sep(self.nr, t_sep, all_lenths)
+        self.inv_t_nr: str = replace_for_col_sep(self.nr, inv_t_sep, all_lenths)
+        self.first_nr: str = '\u250c' + self.nr[1:-2] + '\u2510' + self.nl
+        self.last_nr: str = '\u2514' + self.nr[1:-2] + '\u2518' + self.nl
+        self.empty_from_cells: str = \
+            self.sl + get_spaces('', all_lenths.from_word) + self.nc + get_spaces('', all_lenths.from_grammar) + \
+            self.nc + get_spaces('', all_lenths.tone) + self.nc + get_spaces('', all_lenths.context) + self.nc
+
+
+# deprecated
 def retrieve_console_table_to_word(
         console_table: str, entry_from_word: str, entry_from_grammar: str, entry_tone: str, entry_context: str,
         entry_word: EntryWord, all_lenths: AllLengths, sl: str, nc: str, el: str, nl: str
 ):
+    to_word: ToWord
+    file: io.StringIO = io.StringIO()
+    file.write(console_table)
     for to_word in entry_word.to_words:
-        console_table += entry_from_word
-        entry_from_word = sl + '' + get_spaces('', all_lenths.from_word) + nc
-        console_table += entry_from_grammar
-        entry_from_grammar = '' + get_spaces('', all_lenths.from_grammar) + nc
-        console_table += entry_tone
-        entry_tone = '' + get_spaces('', all_lenths.tone) + nc
-        console_table += entry_context
-        entry_context = '' + get_spaces('', all_lenths.context) + nc
-        console_table += \
-            to_word.to_word + get_spaces(to_word.to_word, all_lenths.to_word) + nc
-        console_table += \
-            to_word.to_grammar + get_spaces(to_word.to_grammar, all_lenths.to_grammar) + nc
-        console_table += \
-            to_word.note + get_spaces(to_word.note, all_lenths.note) + el + nl
-    return console_table, entry_from_word, entry_from_grammar, entry_tone, entry_context
+        file.write(entry_from_word + entry_from_grammar + entry_tone + entry_context)
+        entry_from_word = sl + get_spaces('', all_lenths.from_word) + nc
+        entry_from_grammar = get_spaces('', all_lenths.from_grammar) + nc
+        entry_tone = get_spaces('', all_lenths.tone) + nc
+        entry_context = get_spaces('', all_lenths.context) + nc
+        file.write(
+            to_word.to_word.ljust(all_lenths.to_word) + nc + to_word.to_grammar.ljust(all_lenths.to_grammar) + nc +
+            to_word.note.ljust(all_lenths.note) + el + nl)
+    return file.getvalue(), entry_from_word, entry_from_grammar, entry_tone, entry_context
 
 
-def retrieve_console_table_2(translation: Translation, all_lenths: AllLengths) -> str:
-    nl: str = '\n'
-    row_sep = '\u2500'
-    col_sep = '\u2502'
-    nc: str = f' {col_sep} '
-    sl: str = f'{col_sep} '
-    el: str = f' {col_sep}'
-    t_sep: str = '\u252c'
-    inv_t_sep: str = '\u2534'
-    max_row_len: int = all_lenths.get_max_row_len(nc, sl, el)
-    nr: str = '\u251c' + get_spaces('', max_row_len - 2).replace(' ', row_sep) + '\u2524' + nl
-    console_table: str = '\u250c' + nr[1:-2] + '\u2510' + nl
+def iter_console_table_rows(translation: Translation, all_lenths: AllLengths):
+    # the lines of retrieve_console_table one by one, so the work grows with the size of the table alone
+    frame: TableFrame = TableFrame(all_lenths)
+    nc: str = frame.nc
+    sl: str = frame.sl
+    el: str = frame.el
+    nl: str = frame.nl
     entry_section: EntrySection
     entry_word: EntryWord
     to_word: ToWord
     from_example: str
     to_example: str
-    for section_ind in range(len(translation.entry_sections)):
-        entry_section = translation.entry_sections[section_ind]
-        console_table += \
-            sl + entry_section.section_type + \
-            get_spaces(sl + entry_section.section_type + el, max_row_len) + el + nl
-        console_table += replace_for_col_sep(nr, t_sep, all_lenths)
-        for entry_ind in range(len(entry_section.entry_words)):
-            entry_word = entry_section.entry_words[entry_ind]
-            entry_from_word: str = \
-                sl + entry_word.from_word.from_word + \
-                get_spaces(entry_word.from_word.from_word, all_lenths.from_word) + nc
-            entry_from_grammar = \
-                entry_word.from_word.from_grammar + \
-                get_spaces(entry_word.from_word.from_grammar, all_lenths.from_grammar) + nc
-            entry_tone = \
-                entry_word.tone + \
-                get_spaces(entry_word.tone, all_lenths.tone) + nc
-            entry_context = \
-                entry_word.context + \
-                get_spaces(entry_word.context, all_lenths.context) + nc
-            console_table, entry_from_word, entry_from_grammar, entry_tone, entry_context = \
-                retrieve_console_table_to_word(
-                    console_table, entry_from_word, entry_from_grammar, entry_tone, entry_context,
-                    entry_word, all_lenths, sl, nc, el, nl)
-            console_table += replace_for_col_sep(nr, inv_t_sep, all_lenths)
+    yield frame.first_nr
+    for section_ind, entry_section in enumerate(translation.entry_sections):
+        yield (sl + entry_section.section_type).ljust(frame.row_len) + el + nl
+        yield frame.t_nr
+        for entry_ind, entry_word in enumerate(entry_section.entry_words):
+            from_cells: str = \
+                sl + entry_word.from_word.from_word.ljust(all_lenths.from_word) + nc + \
+                entry_word.from_word.from_grammar.ljust(all_lenths.from_grammar) + nc + \
+                entry_word.tone.ljust(all_lenths.tone) + nc + entry_word.context.ljust(all_lenths.context) + nc
+            for to_word in entry_word.to_words:
+                yield \
+                    from_cells + to_word.to_word.ljust(all_lenths.to_word) + nc + \
+                    to_word.to_grammar.ljust(all_lenths.to_grammar) + nc + to_word.note.ljust(all_lenths.note) + el + nl
+                from_cells = frame.empty_from_cells
+            yield frame.inv_t_nr
             for from_example in entry_word.from_examples:
-                console_table += sl + from_example + get_spaces(sl + from_example + el, max_row_len) + el + nl
-            console_table += nr
+                yield (sl + from_example).ljust(frame.row_len) + el + nl
+            yield frame.nr
             for to_example in entry_word.to_examples:
-                console_table += sl + to_example + get_spaces(sl + to_example + el, max_row_len) + el + nl
+                yield (sl + to_example).ljust(frame.row_len) + el + nl
             last_entry: bool = entry_ind == len(entry_section.entry_words) - 1
             last_section: bool = section_ind == len(translation.entry_sections) - 1
             if last_entry and last_section:
-                console_table += '\u2514' + nr[1:-2] + '\u2518' + nl
+                yield frame.last_nr
             elif last_entry:
-                console_table += nr
+                yield frame.nr
             else:
-                console_table += replace_for_col_sep(nr, t_sep, all_lenths)
-    return console_table
+                yield frame.t_nr
+
+
+def retrieve_console_table_2(translation: Translation, all_lenths: AllLengths) -> str:
+    return ''.join(iter_console_table_rows(translation, all_lenths))
 
 
 def retrieve_console_table(translation: Translation) -> str:
@@ -174,6 +190,120 @@ def retrieve_console_table(translation: Translation) -> str:
     return retrieve_console_table_2(translation, all_lenths)
 
 
+def write_console_table(translation: Translation, file, all_lenths: AllLengths | None = None):
+    # retrieve_console_table written to file (sys.stdout, an open file, io.StringIO...) a line at a time, without
+    # holding the whole table
+    if all_lenths is None:
+        all_lenths = retrieve_all_lengths(translation)
+    for row in iter_console_table_rows(translation, all_lenths):
+        file.write(row)
+
+
+def get_bounded_lengths(width: int | None = None) -> AllLengths:
+    # fixed lengths for tables width characters wide (the terminal width by default), shared out among the columns
+    # of the entry rows by CONST_BOUNDED_WEIGHTS; the section type and the examples take the whole row
+    width = width or shutil.get_terminal_size().columns
+    nc: str = ' \u2502 '
+    sl: str = '\u2502 '
+    el: str = ' \u2502'
+    cells_len: int = width - AllLengths().get_row_len_2(nc, sl, el)
+    if cells_len < len(CONST_BOUNDED_WEIGHTS):
+        raise ValueError(f'a console table needs a width of at least {width - cells_len + len(CONST_BOUNDED_WEIGHTS)}'
+                         f' characters, not {width}')
+    weight_sum: int = sum(CONST_BOUNDED_WEIGHTS.values())
+    all_lenths: AllLengths = AllLengths()
+    for column, weight in CONST_BOUNDED_WEIGHTS.items():
+        setattr(all_lenths, column, max(1, cells_len * weight // weight_sum))
+    # the rounding leftover (or excess) goes to the widest columns
+    column_ind: int = 0
+    while all_lenths.get_row_len_2(nc, sl, el) != width:
+        column: str = CONST_BOUNDED_SPARE_COLUMNS[column_ind % len(CONST_BOUNDED_SPARE_COLUMNS)]
+        step: int = 1 if all_lenths.get_row_len_2(nc, sl, el) < width else -1
+        if getattr(all_lenths, column) + step > 0:
+            setattr(all_lenths, column, getattr(all_lenths, column) + step)
+        column_ind += 1
+    all_lenths.section_type = all_lenths.from_examples = all_lenths.to_examples = width - 4
+    return all_lenths
+
+
+def fit_cell(s: str, length: int, overflow: str) -> [str]:
+    # the lines of a cell length characters wide: cut with an ellipsis, or wrapped over as many lines as needed
+    if len(s) <= length:
+        return [s.ljust(length)]
+    if overflow == 'truncate':
+        return [s[:length - 1] + '\u2026']
+    return [line.ljust(length) for line in textwrap.wrap(s, length)] or [get_spaces('', length)]
+
+
+def iter_fitted_rows(cells: [str], lengths: [int], overflow: str, first: str, separator: str, last: str):
+    # the lines of one row of cells, which is higher than one line when a wrapped cell is
+    cell_lines: [[str]] = [fit_cell(cell, length, overflow) for cell, length in zip(cells, lengths)]
+    for line_ind in range(max(len(lines) for lines in cell_lines)):
+        yield first + separator.join(lines[line_ind] if line_ind < len(lines) else get_spaces('', length)
+                                     for lines, length in zip(cell_lines, lengths)) + last
+
+
+def iter_bounded_console_table_rows(entry_sections, all_lenths: AllLengths | None = None,
+                                    overflow: str = 'truncate'):
+    # the lines of a table of lengths all_lenths (get_bounded_lengths by default) for entry_sections, any iterable of
+    # EntrySection as iter_entry_sections gives, rendered as each one arrives. Longer cells are cut (truncate) or
+    # continued on the next lines (wrap); the table is laid out as in retrieve_console_table
+    if overflow not in ('truncate', 'wrap'):
+        raise ValueError(f'unknown overflow "{overflow}", it must be truncate or wrap')
+    all_lenths = all_lenths or get_bounded_lengths()
+    frame: TableFrame = TableFrame(all_lenths)
+    nc: str = frame.nc
+    sl: str = frame.sl
+    el: str = frame.el + frame.nl
+    row_lengths: [int] = [frame.row_len - len(sl)]
+    from_lengths: [int] = [all_lenths.from_word, all_lenths.from_grammar, all_lenths.tone, all_lenths.context]
+    to_lengths: [int] = [all_lenths.to_word, all_lenths.to_grammar, all_lenths.note]
+    entry_section: EntrySection
+    entry_word: EntryWord
+    to_word: ToWord
+    example: str
+    # the line closing the last entry word, which depends on whether another section follows
+    pending_nr: bool = False
+    yield frame.first_nr
+    for entry_section in entry_sections:
+        if pending_nr:
+            yield frame.nr
+        yield from iter_fitted_rows([entry_section.section_type], row_lengths, overflow, sl, nc, el)
+        yield frame.t_nr
+        for entry_ind, entry_word in enumerate(entry_section.entry_words):
+            if entry_ind > 0:
+                yield frame.t_nr
+            from_cells: [str] = [entry_word.from_word.from_word, entry_word.from_word.from_grammar, entry_word.tone,
+                                 entry_word.context]
+            for to_word in entry_word.to_words:
+                yield from iter_fitted_rows(from_cells + [to_word.to_word, to_word.to_grammar, to_word.note],
+                                            from_lengths + to_lengths, overflow, sl, nc, el)
+                from_cells = ['', '', '', '']
+            yield frame.inv_t_nr
+            for example in entry_word.from_examples:
+                yield from iter_fitted_rows([example], row_lengths, overflow, sl, nc, el)
+            yield frame.nr
+            for example in entry_word.to_examples:
+                yield from iter_fitted_rows([example], row_lengths, overflow, sl, nc, el)
+        pending_nr = len(entry_section.entry_words) > 0
+    if pending_nr:
+        yield frame.last_nr
+
+
+def write_bounded_console_tables(translations, file, width: int | None = None, overflow: str = 'truncate') -> int:
+    # one bounded table per translation, after a <from_lang><to_lang>/<word> line, flushed one by one so a terminal
+    # shows each as soon as it is written; nothing but the translation being written is held
+    all_lenths: AllLengths = get_bounded_lengths(width)
+    count: int = 0
+    for translation in translations:
+        file.write(f'{translation.from_lang}{translation.to_lang}/{translation.from_word}\n')
+        for row in iter_bounded_console_table_rows(translation.entry_sections, all_lenths, overflow):
+            file.write(row)
+        file.flush()
+        count += 1
+    return count
+
+
 def example_7_for_console_table():
     translation: Translation = retrieve_translation(from_lang='en', to_lang='es', word='house')
     console_table: str = retrieve_console_table(translation)
@@ -0,0 +1,124 @@
+__author__ = 'Guillermo Rodolfo Ellison'
+
+import gzip
+import json
+import os
+import tarfile
+import zipfile
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from urllib.parse import unquote
+
+from word_translator_client import Translation, parse_translation_html
+
+CONST_PAGE_SUFFIXES = ('.html', '.htm', '.html.gz', '.htm.gz')
+
+
+def is_page_name(name: str) -> bool:
+    return name.lower().endswith(CONST_PAGE_SUFFIXES)
+
+
+def parse_page_name(name: str) -> (str, str, str):
+    # saved pages mirror the wordreference url: <from_lang><to_lang>/<word>.html, e.g. esen/casa.html
+    parts: [str] = name.replace('\\', '/').split('/')
+    if len(parts) < 2 or len(parts[-2]) != 4:
+        raise ValueError(f'"{name}" is not a <from_lang><to_lang>/<word>.html page')
+    word: str = parts[-1]
+    word = word[:-3] if word.lower().endswith('.gz') else word
+    word = word[:word.rindex('.')]
+    return parts[-2][:2], parts[-2][2:], unquote(word)
+
+
+def iter_corpus_entries(source: str):
+    # yields (name, path, data) for every page of a directory, a zip or a tar archive: the pages of a directory are
+    # given by path, for whoever parses them to read, and the members of an archive by their bytes, read one at a time
+    if os.path.isdir(source):
+        for root, dir_names, file_names in os.walk(source):
+            dir_names.sort()
+            for file_name in sorted(file_names):
+                if is_page_name(file_name):
+                    path: str = os.path.join(root, file_name)
+                    yield os.path.relpath(path, source), path, None
+    elif zipfile.is_zipfile(source):
+        with zipfile.ZipFile(source) as archive:
+            for name in archive.namelist():
+                if is_page_name(name):
+                    yield name, None, archive.read(name)
+    elif tarfile.is_tarfile(source):
+        with tarfile.open(source, 'r:*') as archive:
+            for member in archive:
+                if member.isfile() and is_page_name(member.name):
+                    yield member.name, None, archive.extractfile(member).read()
+            archive.members = []
+    else:
+        raise ValueError(f'"{source}" is not a directory, a zip or a tar archive')
+
+
+def read_page(path: str) -> bytes:
+    with open(path, 'rb') as file:
+        return file.read()
+
+
+def iter_corpus_pages(source: str):
+    # yields (name, data) for every page of a directory, a zip or a tar archive, reading one page at a time
+    for name, path, data in iter_corpus_entries(source):
+        yield name, read_page(path) if data is None else data
+
+
+def iter_chunks(pages, chunksize: int):
+    chunk: list = []
+    for page in pages:
+        chunk.append(page)
+        if len(chunk) >= chunksize:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def reparse_page(name: str, data: bytes | None, decoded: bool, backend: str = 'python', path: str | None = None) -> str:
+    # the page is data, or the file at path when data is None
+    from_lang: str = ''
+    to_lang: str = ''
+    word: str = name
+    try:
+        from_lang, to_lang, word = parse_page_name(name)
+        if data is None:
+            data = read_page(path)
+        if name.lower().endswith('.gz'):
+            data = gzip.decompress(data)
+        translation: Translation = parse_translation_html(data, from_lang, to_lang, word, backend=backend)
+    except Exception as error:
+        return json.dumps({'from_lang': from_lang, 'to_lang': to_lang, 'from_word': word,
+                           'error': f'{type(error).__name__}: {error}'}, ensure_ascii=decoded)
+    return translation.to_json_decoded(None) if decoded else translation.to_json_encoded(None)
+
+
+def reparse_chunk(chunk: [(str, str | None, bytes | None)], decoded: bool, backend: str = 'python') -> [str]:
+    # (name, path, data) entries of iter_corpus_entries
+    return [reparse_page(name, data, decoded, backend, path) for name, path, data in chunk]
+
+
+def iter_reparsed_lines(source: str, workers: int | None = None, chunksize: int = 64, decoded: bool = False,
+                        backend: str = 'python'):
+    # one json line per page, in corpus order; the workers read the pages of a directory themselves, so the parent only
+    # lists them (and reads the members of an archive) and holds twice workers chunks at a time
+    workers = workers or os.cpu_count() or 1
+    pending: deque = deque()
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for chunk in iter_chunks(iter_corpus_entries(source), chunksize):
+            pending.append(executor.submit(reparse_chunk, chunk, decoded, backend))
+            if len(pending) >= workers * 2:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
+
+
+def reparse_corpus(source: str, output, workers: int | None = None, chunksize: int = 64,
+                   decoded: bool = False, backend: str = 'python') -> int:
+    count: int = 0
+    for line in iter_reparsed_lines(source, workers, chunksize, decoded, backend):
+        output.write(line)
+        output.write('\n')
+        count += 1
+    return count
@@ -0,0 +1,209 @@
+__author__ = 'Guillermo Rodolfo Ellison'
+
+import sqlite3
+import sys
+import threading
+import time
+import zlib
+from collections import OrderedDict
+
+from word_translator_client import EntrySection, EntryWord, ToWord, Translation, trim_html
+
+
+class HtmlCache:
+    # pages are stored as the zlib compressed articleWRD..collinsdiv part returned by trim_html, which clean_html
+    # turns into the same text as the whole page
+    def __init__(self, path: str, ttl: float | None = 7 * 24 * 3600, max_bytes: int = 1 << 30,
+                 compress_level: int = 6):
+        self.path: str = path
+        self.ttl: float | None = ttl
+        self.max_bytes: int = max_bytes
+        self.compress_level: int = compress_level
+        self.lock: threading.Lock = threading.Lock()
+        self.connection: sqlite3.Connection = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self.connection.execute('PRAGMA journal_mode=WAL')
+        self.connection.execute('PRAGMA synchronous=NORMAL')
+        self.connection.execute(
+            'CREATE TABLE IF NOT EXISTS pages (from_lang TEXT, to_lang TEXT, word TEXT, stored_at REAL, '
+            'accessed_at REAL, size INTEGER, html BLOB, PRIMARY KEY (from_lang, to_lang, word)) WITHOUT ROWID')
+        self.connection.execute('CREATE INDEX IF NOT EXISTS pages_accessed_at ON pages (accessed_at)')
+        # kept in memory, so other processes writing to the same file are only seen after reopening it
+        self.total_bytes: int = self.connection.execute('SELECT COALESCE(SUM(size), 0) FROM pages').fetchone()[0]
+        self.hits: int = 0
+        self.misses: int = 0
+        self.evictions: int = 0
+        self.expirations: int = 0
+
+    def get(self, from_lang: str, to_lang: str, word: str) -> str | None:
+        now: float = time.time()
+        with self.lock:
+            row = self.connection.execute(
+                'SELECT stored_at, size, html FROM pages WHERE from_lang=? AND to_lang=? AND word=?',
+                (from_lang, to_lang, word)).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            stored_at, size, data = row
+            if self.ttl is not None and now - stored_at > self.ttl:
+                self.delete(from_lang, to_lang, word, size)
+                self.expirations += 1
+                self.misses += 1
+                return None
+            self.connection.execute('UPDATE pages SET accessed_at=? WHERE from_lang=? AND to_lang=? AND word=?',
+                                    (now, from_lang, to_lang, word))
+            self.hits += 1
+        return zlib.decompress(data).decode('utf-8')
+
+    def put(self, from_lang: str, to_lang: str, word: str, html: str):
+        data: bytes = zlib.compress(trim_html(html).encode('utf-8'), self.compress_level)
+        now: float = time.time()
+        with self.lock:
+            row = self.connection.execute('SELECT size FROM pages WHERE from_lang=? AND to_lang=? AND word=?',
+                                          (from_lang, to_lang, word)).fetchone()
+            self.connection.execute('INSERT OR REPLACE INTO pages VALUES (?, ?, ?, ?, ?, ?, ?)',
+                                    (from_lang, to_lang, word, now, now, len(data), data))
+            self.total_bytes += len(data) - (row[0] if row else 0)
+            self.evict()
+
+    def delete(self, from_lang: str, to_lang: str, word: str, size: int):
+        self.connection.execute('DELETE FROM pages WHERE from_lang=? AND to_lang=? AND word=?',
+                                (from_lang, to_lang, word))
+        self.total_bytes -= size
+
+    def evict(self):
+        while self.total_bytes > self.max_bytes:
+            rows = self.connection.execute(
+                'SELECT from_lang, to_lang, word, size FROM pages ORDER BY accessed_at LIMIT 64').fetchall()
+            if not rows:
+                self.total_bytes = 0
+                return
+            self.connection.execute('BEGIN')
+            for from_lang, to_lang, word, size in rows:
+                self.delete(from_lang, to_lang, word, size)
+                self.evictions += 1
+                if self.total_bytes <= self.max_bytes:
+                    break
+            self.connection.execute('COMMIT')
+
+    def invalidate(self, from_lang: str, to_lang: str, word: str):
+        with self.lock:
+            row = self.connection.execute('SELECT size FROM pages WHERE from_lang=? AND to_lang=? AND word=?',
+                                          (from_lang, to_lang, word)).fetchone()
+            if row is not None:
+                self.delete(from_lang, to_lang, word, row[0])
+
+    def iter_keys(self, from_lang: str | None = None, to_lang: str | None = None):
+        # (from_lang, to_lang, word) of the stored pages, expired ones included until they are read
+        with self.lock:
+            if from_lang is None:
+                rows: [(str, str, str)] = self.connection.execute(
+                    'SELECT from_lang, to_lang, word FROM pages').fetchall()
+            else:
+                rows = self.connection.execute('SELECT from_lang, to_lang, word FROM pages WHERE from_lang=? AND '
+                                               'to_lang=?', (from_lang, to_lang)).fetchall()
+        yield from rows
+
+    def clear(self):
+        with self.lock:
+            self.connection.execute('DELETE FROM pages')
+            self.total_bytes = 0
+
+    def get_stats(self) -> dict:
+        with self.lock:
+            entries: int = self.connection.execute('SELECT COUNT(*) FROM pages').fetchone()[0]
+            return {'hits': self.hits, 'misses': self.misses, 'evictions': self.evictions,
+                    'expirations': self.expirations, 'entries': entries, 'bytes': self.total_bytes}
+
+    def close(self):
+        with self.lock:
+            self.connection.close()
+
+
+def estimate_translation_size(translation: Translation) -> int:
+    # object headers, lists and the free text fields; grammar, tone, note and section type values repeat across
+    # entries and are left out, which is close enough to bound a cache by bytes
+    entry_section: EntrySection
+    entry_word: EntryWord
+    to_word: ToWord
+    size: int = sys.getsizeof(translation) + sys.getsizeof(translation.entry_sections)
+    for entry_section in translation.entry_sections:
+        size += sys.getsizeof(entry_section) + sys.getsizeof(entry_section.entry_words)
+        for entry_word in entry_section.entry_words:
+            size += sys.getsizeof(entry_word) + sys.getsizeof(entry_word.from_word) + \
+                    sys.getsizeof(entry_word.from_word.from_word) + sys.getsizeof(entry_word.context) + \
+                    sys.getsizeof(entry_word.to_words) + sys.getsizeof(entry_word.from_examples) + \
+                    sys.getsizeof(entry_word.to_examples)
+            for to_word in entry_word.to_words:
+                size += sys.getsizeof(to_word) + sys.getsizeof(to_word.to_word)
+            size += sum(sys.getsizeof(example) for example in entry_word.from_examples)
+            size += sum(sys.getsizeof(example) for example in entry_word.to_examples)
+    return size
+
+
+class TranslationCache:
+    # the cached Translation is handed to every caller as is, so it must not be modified
+    def __init__(self, max_entries: int | None = 10000, max_bytes: int | None = None):
+        self.max_entries: int | None = max_entries
+        self.max_bytes: int | None = max_bytes
+        self.lock: threading.Lock = threading.Lock()
+        self.entries: OrderedDict = OrderedDict()
+        self.total_bytes: int = 0
+        self.hits: int = 0
+        self.misses: int = 0
+        self.evictions: int = 0
+
+    def get(self, from_lang: str, to_lang: str, word: str) -> Translation | None:
+        key: (str, str, str) = (from_lang, to_lang, word)
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, from_lang: str, to_lang: str, word: str, translation: Translation):
+        key: (str, str, str) = (from_lang, to_lang, word)
+        size: int = 0 if self.max_bytes is None else estimate_translation_size(translation)
+        with self.lock:
+            old_entry = self.entries.pop(key, None)
+            if old_entry is not None:
+                self.total_bytes -= old_entry[1]
+            self.entries[key] = (translation, size)
+            self.total_bytes += size
+            while self.entries and (self.max_entries is not None and len(self.entries) > self.max_entries or
+                                    self.max_bytes is not None and self.total_bytes > self.max_bytes):
+                _, (_, evicted_size) = self.entries.popitem(last=False)
+                self.total_bytes -= evicted_size
+                self.evictions += 1
+
+    def invalidate(self, from_lang: str, to_lang: str, word: str | None = None):
+        # without a word, every entry of the lang pair is dropped
+        with self.lock:
+            if word is not None:
+                keys: [(str, str, str)] = [(from_lang, to_lang, word)]
+            else:
+                keys = [key for key in self.entries if key[0] == from_lang and key[1] == to_lang]
+            for key in keys:
+                entry = self.entries.pop(key, None)
+                if entry is not None:
+                    self.total_bytes -= entry[1]
+
+    def iter_keys(self):
+        # (from_lang, to_lang, word) of the cached translations, from the least to the most recently used
+        with self.lock:
+            keys: [(str, str, str)] = list(self.entries)
+        yield from keys
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            self.total_bytes = 0
+
+    def get_stats(self) -> dict:
+        with self.lock:
+            lookups: int = self.hits + self.misses
+            return {'hits': self.hits, 'misses': self.misses, 'evictions': self.evictions,
+                    'hit_rate': self.hits / lookups if lookups else 0.0, 'entries': len(self.entries),
+                    'bytes': self.total_bytes}
@@ -0,0 +1,272 @@
+__author__ = 'Guillermo Rodolfo Ellison'
+
+import re
+import threading
+import time
+from array import array
+from collections import deque
+
+from word_translator_client import EntrySection, EntryWord, ToWord, Translation
+
+CONST_EXAMPLE_TERM = re.compile(r"\w+(?:['\-]\w+)*")
+
+
+def normalize_term(word: str) -> str:
+    return ' '.join(word.casefold().split())
+
+
+class IndexHit:
+    __slots__ = ('translation', 'entry_section', 'entry_word')
+
+    def __init__(self, translation: Translation, entry_section: EntrySection, entry_word: EntryWord):
+        self.translation: Translation = translation
+        self.entry_section: EntrySection = entry_section
+        self.entry_word: EntryWord = entry_word
+
+
+class ReverseIndex:
+    # maps normalized words to postings of (translation, section, entry) numbers, three per entry in an array, so
+    # millions of entries cost a few bytes each; to_words are always indexed, from_words and the words of the
+    # examples on request. A translation added again replaces the previous one for its from_lang, to_lang and word:
+    # the postings of the old one are skipped when read, and once they are half of all the postings every array is
+    # rewritten without them
+    def __init__(self, index_from_words: bool = False, index_examples: bool = False):
+        self.index_from_words: bool = index_from_words
+        self.index_examples: bool = index_examples
+        self.lock: threading.Lock = threading.Lock()
+        self.translations: [Translation | None] = []
+        self.translation_ids: dict = {}
+        self.postings: dict = {'to_word': {}, 'from_word': {}, 'example': {}}
+        # the number of postings of each translation, and the replaced translations and postings not yet dropped
+        self.posting_counts: [int] = []
+        self.posting_count: int = 0
+        self.dead_posting_count: int = 0
+        self.dead_translation_count: int = 0
+
+    def add_posting(self, field: str, term: str, translation_id: int, section_ind: int, entry_ind: int):
+        postings: array | None = self.postings[field].get(term)
+        if postings is None:
+            postings = self.postings[field][term] = array('I')
+        postings.append(translation_id)
+        postings.append(section_ind)
+        postings.append(entry_ind)
+
+    def compact(self):
+        # drops the replaced translations and their postings, renumbering the others; the lock is held by the caller
+        translation: Translation | None
+        new_ids: [int] = []
+        translations: [Translation] = []
+        posting_counts: [int] = []
+        for translation_id, translation in enumerate(self.translations):
+            new_ids.append(len(translations))
+            if translation is not None:
+                translations.append(translation)
+                posting_counts.append(self.posting_counts[translation_id])
+        for field_postings in self.postings.values():
+            for term, postings in list(field_postings.items()):
+                live: array = array('I')
+                for ind in range(0, len(postings), 3):
+                    if self.translations[postings[ind]] is not None:
+                        live.append(new_ids[postings[ind]])
+                        live.append(postings[ind + 1])
+                        live.append(postings[ind + 2])
+                if live:
+                    field_postings[term] = live
+                else:
+                    del field_postings[term]
+        self.translation_ids = {key: new_ids[translation_id] for key, translation_id in self.translation_ids.items()}
+        self.translations = translations
+        self.posting_counts = posting_counts
+        self.posting_count -= self.dead_posting_count
+        self.dead_posting_count = 0
+        self.dead_translation_count = 0
+
+    def add(self, translation: Translation) -> int:
+        entry_section: EntrySection
+        entry_word: EntryWord
+        to_word: ToWord
+        key: (str, str, str) = (translation.from_lang, translation.to_lang, translation.from_word)
+        with self.lock:
+            old_id: int | None = self.translation_ids.get(key)
+            if old_id is not None:
+                self.translations[old_id] = None
+                self.dead_posting_count += self.posting_counts[old_id]
+                self.dead_translation_count += 1
+                if self.dead_posting_count * 2 > self.posting_count or \
+                        self.dead_translation_count * 2 > len(self.translations):
+                    self.compact()
+            translation_id: int = len(self.translations)
+            self.translations.append(translation)
+            self.translation_ids[key] = translation_id
+            count: int = 0
+            for section_ind, entry_section in enumerate(translation.entry_sections):
+                for entry_ind, entry_word in enumerate(entry_section.entry_words):
+                    for term in {normalize_term(to_word.to_word) for to_word in entry_word.to_words}:
+                        self.add_posting('to_word', term, translation_id, section_ind, entry_ind)
+                        count += 1
+                    if self.index_from_words:
+                        self.add_posting('from_word', normalize_term(entry_word.from_word.from_word), translation_id,
+                                         section_ind, entry_ind)
+                        count += 1
+                    if self.index_examples:
+                        terms: set = set()
+                        for example in entry_word.from_examples + entry_word.to_examples:
+                            terms.update(CONST_EXAMPLE_TERM.findall(example.casefold()))
+                        for term in terms:
+                            self.add_posting('example', term, translation_id, section_ind, entry_ind)
+                        count += len(terms)
+            self.posting_counts.append(count)
+            self.posting_count += count
+        return translation_id
+
+    def add_all(self, translations) -> int:
+        count: int = 0
+        for translation in translations:
+            self.add(translation)
+            count += 1
+        return count
+
+    def lookup(self, word: str, field: str = 'to_word', from_lang: str | None = None, to_lang: str | None = None,
+               limit: int | None = None) -> [IndexHit]:
+        # field is to_word, from_word or example; from_lang and to_lang narrow the hits to one lang pair
+        hits: [IndexHit] = []
+        with self.lock:
+            postings: array | None = self.postings[field].get(normalize_term(word))
+            if postings is None:
+                return hits
+            for ind in range(0, len(postings), 3):
+                translation: Translation | None = self.translations[postings[ind]]
+                if translation is None or from_lang is not None and translation.from_lang != from_lang or \
+                        to_lang is not None and translation.to_lang != to_lang:
+                    continue
+                entry_section: EntrySection = translation.entry_sections[postings[ind + 1]]
+                hits.append(IndexHit(translation, entry_section, entry_section.entry_words[postings[ind + 2]]))
+                if limit is not None and len(hits) >= limit:
+                    break
+        return hits
+
+    def get_source_words(self, word: str, from_lang: str | None = None, to_lang: str | None = None) -> [str]:
+        # the distinct from_words whose entries translate to word, in the order they were added
+        hit: IndexHit
+        return list(dict.fromkeys(hit.entry_word.from_word.from_word for hit in self.lookup(
+            word, 'to_word', from_lang, to_lang)))
+
+    def get_stats(self) -> dict:
+        with self.lock:
+            return {'translations': len(self.translation_ids),
+                    'terms': {field: len(postings) for field, postings in self.postings.items()},
+                    'postings': {field: sum(len(entries) for entries in postings.values()) // 3
+                                 for field, postings in self.postings.items()},
+                    'dead_postings': self.dead_posting_count}
+
+
+def find_completions(root: dict, prefix: str, limit: int, deadline: float | None) -> [str]:
+    # breadth first, so shorter headwords come first, and in character order within a length
+    node: dict | None = root
+    for char in prefix:
+        node = node.get(char)
+        if node is None:
+            return []
+    completions: [str] = []
+    pending: deque = deque([node])
+    visited: int = 0
+    while pending and len(completions) < limit:
+        node = pending.popleft()
+        if None in node:
+            completions.append(node[None])
+        pending.extend(node[char] for char in sorted(char for char in node if char is not None))
+        visited += 1
+        if deadline is not None and not visited % 64 and time.perf_counter() > deadline:
+            break
+    return completions
+
+
+def find_corrections(root: dict, word: str, max_distance: int, limit: int, deadline: float | None) -> [(str, int)]:
+    # walks the trie keeping one row of the levenshtein table per node, and leaves a branch once every cell of the
+    # row is over max_distance
+    corrections: [(int, str)] = []
+    columns: int = len(word) + 1
+    pending: [(dict, str, [int])] = [(child, char, list(range(columns))) for char, child in root.items()
+                                     if char is not None]
+    visited: int = 0
+    while pending:
+        node, char, previous_row = pending.pop()
+        row: [int] = [previous_row[0] + 1]
+        for column in range(1, columns):
+            row.append(min(row[column - 1] + 1, previous_row[column] + 1,
+                           previous_row[column - 1] + (word[column - 1] != char)))
+        if row[-1] <= max_distance and None in node:
+            corrections.append((row[-1], node[None]))
+        if min(row) <= max_distance:
+            pending.extend((child, child_char, row) for child_char, child in node.items() if child_char is not None)
+        visited += 1
+        if deadline is not None and not visited % 64 and time.perf_counter() > deadline:
+            break
+    corrections.sort(key=lambda correction: (correction[0], len(correction[1]), correction[1]))
+    return [(headword, distance) for distance, headword in corrections[:limit]]
+
+
+class HeadwordIndex:
+    # a trie of the casefolded headwords of each lang pair, where a node maps characters to nodes and None to the
+    # headword ending there, to complete and correct partial words before asking for them
+    def __init__(self):
+        self.lock: threading.Lock = threading.Lock()
+        self.tries: dict = {}
+
+    def add(self, from_lang: str, to_lang: str, word: str):
+        with self.lock:
+            node: dict = self.tries.setdefault((from_lang, to_lang), {})
+            for char in normalize_term(word):
+                child: dict | None = node.get(char)
+                if child is None:
+                    child = node[char] = {}
+                node = child
+            node.setdefault(None, word)
+
+    def add_keys(self, keys) -> int:
+        # (from_lang, to_lang, word) keys, as given by the iter_keys of HtmlCache, TranslationCache and
+        # TranslationPack
+        count: int = 0
+        for from_lang, to_lang, word in keys:
+            self.add(from_lang, to_lang, word)
+            count += 1
+        return count
+
+    def find(self, from_lang: str, to_lang: str, word: str) -> str | None:
+        # the known headword for word, or None when it is not known and not worth a request
+        with self.lock:
+            node: dict | None = self.tries.get((from_lang, to_lang))
+            for char in normalize_term(word):
+                if node is None:
+                    return None
+                node = node.get(char)
+            return None if node is None else node.get(None)
+
+    def complete(self, from_lang: str, to_lang: str, prefix: str, limit: int = 10,
+                 time_budget: float | None = None) -> [str]:
+        deadline: float | None = None if time_budget is None else time.perf_counter() + time_budget
+        with self.lock:
+            return find_completions(self.tries.get((from_lang, to_lang), {}), normalize_term(prefix), limit, deadline)
+
+    def correct(self, from_lang: str, to_lang: str, word: str, max_distance: int = 1, limit: int = 10,
+                time_budget: float | None = None) -> [(str, int)]:
+        # (headword, edit distance) pairs, closest first
+        deadline: float | None = None if time_budget is None else time.perf_counter() + time_budget
+        with self.lock:
+            return find_corrections(self.tries.get((from_lang, to_lang), {}), normalize_term(word), max_distance,
+                                    limit, deadline)
+
+    def suggest(self, from_lang: str, to_lang: str, text: str, limit: int = 10, max_distance: int = 1,
+                time_budget: float | None = 0.005) -> [str]:
+        # completions of text first, then headwords within max_distance edits of it, all within one time budget;
+        # when the budget runs out the candidates found so far are returned
+        deadline: float | None = None if time_budget is None else time.perf_counter() + time_budget
+        with self.lock:
+            root: dict = self.tries.get((from_lang, to_lang), {})
+            term: str = normalize_term(text)
+            suggestions: [str] = find_completions(root, term, limit, deadline)
+            if len(suggestions) < limit and (deadline is None or time.perf_counter() < deadline):
+                for headword, _ in find_corrections(root, term, max_distance, limit, deadline):
+                    if headword not in suggestions:
+                        suggestions.append(headword)
+        return suggestions[:limit]
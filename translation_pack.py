@@ -0,0 +1,157 @@
+__author__ = 'Guillermo Rodolfo Ellison'
+
+import mmap
+import os
+import struct
+import sys
+from hashlib import blake2b
+
+from word_translator_client import EntrySection, Translation, translation_from_bytes, translation_to_bytes
+
+CONST_PACK_MAGIC = b'WTPK'
+CONST_PACK_VERSION = 1
+# magic, version, from_lang, to_lang, translation count, index slot count, index offset
+CONST_PACK_HEADER = struct.Struct('<4sB3x8s8sIIQ')
+# word hash, record offset, word length, record length; a zero offset is an empty slot
+CONST_PACK_SLOT = struct.Struct('<QQII')
+
+
+def hash_word(word: bytes) -> int:
+    return int.from_bytes(blake2b(word, digest_size=8).digest(), 'little')
+
+
+# the entry_sections slot of Translation, which the property of PackedTranslation hides
+translation_entry_sections = Translation.__dict__['entry_sections']
+
+
+class PackedTranslation(Translation):
+    # a Translation from a pack: the langs and the word come from the pack and the lookup, and the entry sections are
+    # decoded from the binary record the first time they are read, so a lookup costs about as much as finding the
+    # record
+    __slots__ = ('record',)
+
+    def __init__(self, from_lang: str, to_lang: str, from_word: str, record: bytes):
+        self.from_lang: str = sys.intern(from_lang)
+        self.to_lang: str = sys.intern(to_lang)
+        self.from_word: str = from_word
+        self.record: bytes | None = record
+
+    @property
+    def entry_sections(self) -> [EntrySection]:
+        if self.record is not None:
+            translation_entry_sections.__set__(self, translation_from_bytes(self.record).entry_sections)
+            self.record = None
+        return translation_entry_sections.__get__(self)
+
+    @entry_sections.setter
+    def entry_sections(self, entry_sections: [EntrySection]):
+        translation_entry_sections.__set__(self, entry_sections)
+        self.record = None
+
+
+def write_translation_pack(path: str, translations, from_lang: str | None = None, to_lang: str | None = None) -> int:
+    # a pack holds one lang pair: the header, then every word followed by its binary record, then an open addressing
+    # hash index with at most half of its slots used. A word given twice keeps its last translation
+    translation: Translation
+    slots: dict = {}
+    temp_path: str = path + '.tmp'
+    try:
+        with open(temp_path, 'wb') as file:
+            file.write(bytes(CONST_PACK_HEADER.size))
+            offset: int = CONST_PACK_HEADER.size
+            for translation in translations:
+                from_lang = from_lang or translation.from_lang
+                to_lang = to_lang or translation.to_lang
+                if (translation.from_lang, translation.to_lang) != (from_lang, to_lang):
+                    raise ValueError(f'a {from_lang}{to_lang} pack cannot hold the {translation.from_lang}'
+                                     f'{translation.to_lang} translation of "{translation.from_word}"')
+                word: bytes = translation.from_word.encode('utf-8')
+                record: bytes = translation_to_bytes(translation)
+                file.write(word)
+                file.write(record)
+                slots[word] = (offset, len(record))
+                offset += len(word) + len(record)
+            slot_count: int = 8
+            while slot_count < 2 * len(slots):
+                slot_count *= 2
+            index: bytearray = bytearray(slot_count * CONST_PACK_SLOT.size)
+            for word, (record_offset, record_length) in slots.items():
+                word_hash: int = hash_word(word)
+                slot: int = word_hash & (slot_count - 1)
+                while CONST_PACK_SLOT.unpack_from(index, slot * CONST_PACK_SLOT.size)[1]:
+                    slot = (slot + 1) & (slot_count - 1)
+                CONST_PACK_SLOT.pack_into(index, slot * CONST_PACK_SLOT.size, word_hash, record_offset, len(word),
+                                          record_length)
+            file.write(index)
+            file.seek(0)
+            file.write(CONST_PACK_HEADER.pack(CONST_PACK_MAGIC, CONST_PACK_VERSION,
+                                              (from_lang or '').encode('ascii'), (to_lang or '').encode('ascii'),
+                                              len(slots), slot_count, offset))
+    except BaseException:
+        os.remove(temp_path)
+        raise
+    os.replace(temp_path, path)
+    return len(slots)
+
+
+class TranslationPack:
+    # read only and memory mapped, so every process opening the same pack shares its pages through the page cache
+    def __init__(self, path: str):
+        self.path: str = path
+        with open(path, 'rb') as file:
+            self.mmap: mmap.mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, from_lang, to_lang, self.count, self.slot_count, self.index_offset = \
+            CONST_PACK_HEADER.unpack_from(self.mmap)
+        if magic != CONST_PACK_MAGIC:
+            self.mmap.close()
+            raise ValueError(f'"{path}" is not a translation pack')
+        if version != CONST_PACK_VERSION:
+            self.mmap.close()
+            raise ValueError(f'"{path}" has the unsupported translation pack version {version}')
+        self.from_lang: str = from_lang.rstrip(b'\0').decode('ascii')
+        self.to_lang: str = to_lang.rstrip(b'\0').decode('ascii')
+
+    def get_record(self, word: str) -> bytes | None:
+        key: bytes = word.encode('utf-8')
+        word_hash: int = hash_word(key)
+        mask: int = self.slot_count - 1
+        slot: int = word_hash & mask
+        while True:
+            slot_hash, offset, word_length, record_length = CONST_PACK_SLOT.unpack_from(
+                self.mmap, self.index_offset + slot * CONST_PACK_SLOT.size)
+            if not offset:
+                return None
+            if slot_hash == word_hash and self.mmap[offset:offset + word_length] == key:
+                return self.mmap[offset + word_length:offset + word_length + record_length]
+            slot = (slot + 1) & mask
+
+    def get(self, word: str) -> PackedTranslation | None:
+        record: bytes | None = self.get_record(word)
+        return None if record is None else PackedTranslation(self.from_lang, self.to_lang, word, record)
+
+    def iter_keys(self):
+        # (from_lang, to_lang, word) of every translation, in file order
+        words: [(int, int)] = []
+        for slot in range(self.slot_count):
+            _, offset, word_length, _ = CONST_PACK_SLOT.unpack_from(
+                self.mmap, self.index_offset + slot * CONST_PACK_SLOT.size)
+            if offset:
+                words.append((offset, word_length))
+        words.sort()
+        for offset, word_length in words:
+            yield self.from_lang, self.to_lang, self.mmap[offset:offset + word_length].decode('utf-8')
+
+    def __contains__(self, word: str) -> bool:
+        return self.get_record(word) is not None
+
+    def __len__(self) -> int:
+        return self.count
+
+    def close(self):
+        self.mmap.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
@@ -0,0 +1,135 @@
+__author__ = 'Guillermo Rodolfo Ellison'
+
+import asyncio
+import codecs
+import time
+from concurrent.futures import Executor
+
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+from word_translator_client import CONST_BASE_URL, CONST_CHUNK_SIZE, HtmlTrimmer, Translation, TranslationResult, \
+    emit_metrics, get_parser_backend, metrics_hooks, parse_translation_html, to_lookup
+
+CONST_RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+
+async def read_trimmed_html(response: 'aiohttp.ClientResponse') -> str:
+    trimmer: HtmlTrimmer = HtmlTrimmer()
+    decoder: codecs.IncrementalDecoder = codecs.getincrementaldecoder(response.charset or 'utf-8')('replace')
+    size: int = 0
+    async for chunk in response.content.iter_chunked(CONST_CHUNK_SIZE):
+        size += len(chunk)
+        if trimmer.feed(decoder.decode(chunk)):
+            break
+    else:
+        trimmer.feed(decoder.decode(b'', True))
+    if metrics_hooks:
+        emit_metrics(fetch_bytes=size)
+    return trimmer.get_html()
+
+
+class AsyncTranslatorClient:
+    def __init__(self, base_url: str = CONST_BASE_URL, connect_timeout: float = 5.0, read_timeout: float = 30.0,
+                 max_retries: int = 3, backoff_factor: float = 0.5, limit: int = 100,
+                 executor: Executor | None = None, early_cutoff: bool = True, parser_backend: str = 'python'):
+        if aiohttp is None:
+            raise ImportError('AsyncTranslatorClient requires aiohttp: pip install word-translator-py[async]')
+        self.base_url: str = base_url.rstrip('/')
+        self.timeout: aiohttp.ClientTimeout = aiohttp.ClientTimeout(sock_connect=connect_timeout,
+                                                                    sock_read=read_timeout)
+        self.max_retries: int = max_retries
+        self.backoff_factor: float = backoff_factor
+        self.limit: int = limit
+        # None runs the parsing in the loop's default thread pool, a ProcessPoolExecutor moves it off the GIL
+        self.executor: Executor | None = executor
+        # stop downloading once the collinsdiv marker is read, at the cost of not reusing that connection
+        self.early_cutoff: bool = early_cutoff
+        # a name from parser_backends, which must also be registered in the executor's processes
+        self.parser_backend: str = parser_backend
+        get_parser_backend(parser_backend)
+        self.session: aiohttp.ClientSession | None = None
+
+    def get_url(self, from_lang: str, to_lang: str, word: str) -> str:
+        return f"{self.base_url}/{from_lang}{to_lang}/{word}"
+
+    def get_session(self) -> 'aiohttp.ClientSession':
+        # created on first use, so that it belongs to the running loop
+        if self.session is None or self.session.closed:
+            self.session = aiohttp.ClientSession(connector=aiohttp.TCPConnector(limit=self.limit),
+                                                 timeout=self.timeout)
+        return self.session
+
+    async def fetch_html(self, from_lang: str, to_lang: str, word: str) -> str:
+        url: str = self.get_url(from_lang, to_lang, word)
+        attempt: int = 0
+        start: float = time.perf_counter()
+        while True:
+            try:
+                async with self.get_session().get(url) as response:
+                    if response.status not in CONST_RETRY_STATUSES or attempt >= self.max_retries:
+                        response.raise_for_status()
+                        if not self.early_cutoff:
+                            if metrics_hooks:
+                                emit_metrics(fetch_seconds=time.perf_counter() - start,
+                                             fetch_bytes=len(await response.read()))
+                            return await response.text()
+                        html: str = await read_trimmed_html(response)
+                        if metrics_hooks:
+                            emit_metrics(fetch_seconds=time.perf_counter() - start)
+                        return html
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError):
+                if attempt >= self.max_retries:
+                    raise
+            await asyncio.sleep(self.backoff_factor * (2 ** attempt))
+            attempt += 1
+
+    async def retrieve_translation(self, from_lang: str, to_lang: str, word: str) -> Translation:
+        html: str = await self.fetch_html(from_lang, to_lang, word)
+        return await asyncio.get_running_loop().run_in_executor(
+            self.executor, parse_translation_html, html, from_lang, to_lang, word, False, False, False,
+            self.parser_backend)
+
+    async def retrieve_translation_result(self, semaphore: asyncio.Semaphore, from_lang: str, to_lang: str,
+                                          word: str) -> TranslationResult:
+        async with semaphore:
+            try:
+                translation: Translation = await self.retrieve_translation(from_lang, to_lang, word)
+            except Exception as error:
+                return TranslationResult(from_lang, to_lang, word, None, error)
+        return TranslationResult(from_lang, to_lang, word, translation, None)
+
+    async def retrieve_translations(self, words, from_lang: str | None = None, to_lang: str | None = None,
+                                    concurrency: int = 100) -> [TranslationResult]:
+        semaphore: asyncio.Semaphore = asyncio.Semaphore(concurrency)
+        return await asyncio.gather(*(
+            self.retrieve_translation_result(semaphore, *to_lookup(item, from_lang, to_lang)) for item in words))
+
+    async def close(self):
+        if self.session is not None:
+            await self.session.close()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()
+
+
+async def retrieve_translation_async(from_lang: str, to_lang: str, word: str,
+                                     client: AsyncTranslatorClient | None = None) -> Translation:
+    if client is not None:
+        return await client.retrieve_translation(from_lang, to_lang, word)
+    async with AsyncTranslatorClient() as client:
+        return await client.retrieve_translation(from_lang, to_lang, word)
+
+
+async def retrieve_translations_async(words, from_lang: str | None = None, to_lang: str | None = None,
+                                      concurrency: int = 100,
+                                      client: AsyncTranslatorClient | None = None) -> [TranslationResult]:
+    if client is not None:
+        return await client.retrieve_translations(words, from_lang, to_lang, concurrency)
+    async with AsyncTranslatorClient(limit=concurrency) as client:
+        return await client.retrieve_translations(words, from_lang, to_lang, concurrency)
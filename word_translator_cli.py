@@ -0,0 +1,188 @@
+__author__ = 'Guillermo Rodolfo Ellison'
+
+import argparse
+import json
+import os
+import sys
+from contextlib import ExitStack
+
+from translation_as_console_table import get_bounded_lengths, iter_bounded_console_table_rows, \
+    retrieve_console_table
+from translation_cache import HtmlCache
+from translation_pack import TranslationPack
+from word_translator_client import CONST_BASE_URL, Translation, TranslationResult, TranslatorClient, \
+    get_parser_backend, retrieve_translations
+
+
+def parse_word_line(line: str, from_lang: str | None, to_lang: str | None) -> tuple | None:
+    # a line holds a word translated from from_lang to to_lang, a <from_lang>TAB<to_lang>TAB<word> triple or, with no
+    # langs given, a <from_lang><to_lang>/<word> name as in the wordreference url; blank lines give None
+    line = line.strip()
+    if not line:
+        return None
+    parts: [str] = line.split('\t')
+    if len(parts) == 3:
+        return parts[0].strip(), parts[1].strip(), parts[2].strip()
+    if len(parts) != 1:
+        raise ValueError(f'"{line}" has {len(parts)} tab separated fields, a <from_lang>TAB<to_lang>TAB<word> triple '
+                         f'has 3')
+    if from_lang is not None and to_lang is not None:
+        return from_lang, to_lang, line
+    lang_pair, _, word = line.partition('/')
+    if len(lang_pair) != 4 or not word:
+        raise ValueError(f'"{line}" is not a <from_lang><to_lang>/<word> name, give --from-lang and --to-lang for '
+                         f'plain words')
+    return lang_pair[:2], lang_pair[2:], word
+
+
+def iter_word_lookups(lines, from_lang: str | None, to_lang: str | None, done: set, rejected: [str]):
+    # the (from_lang, to_lang, word) lookups of lines, skipping the ones in done, which gets the new ones; the lines
+    # that cannot be read are reported on stderr, added to rejected and skipped
+    for line in lines:
+        try:
+            lookup: tuple | None = parse_word_line(line, from_lang, to_lang)
+        except ValueError as error:
+            print(error, file=sys.stderr)
+            rejected.append(line)
+            continue
+        if lookup is not None and lookup not in done:
+            done.add(lookup)
+            yield lookup
+
+
+def read_done_lookups(path: str) -> set:
+    # the (from_lang, to_lang, from_word) of the translations already written to a json lines output; error records
+    # and a last line cut by an interrupted run are left out, so those words are asked for again
+    done: set = set()
+    if not os.path.exists(path):
+        return done
+    with open(path, encoding='utf-8') as file:
+        for line in file:
+            try:
+                record: dict = json.loads(line)
+            except ValueError:
+                continue
+            if 'error' not in record:
+                done.add((record['from_lang'], record['to_lang'], record['from_word']))
+    return done
+
+
+def open_output(path: str | None, resume: bool):
+    if path is None:
+        return sys.stdout
+    if not resume:
+        return open(path, 'w', encoding='utf-8')
+    # appended after a newline when an interrupted run left the last line unfinished
+    ends_with_newline: bool = True
+    with open(path, 'ab+') as file:
+        if file.seek(0, os.SEEK_END):
+            file.seek(-1, os.SEEK_END)
+            ends_with_newline = file.read(1) == b'\n'
+    output = open(path, 'a', encoding='utf-8')
+    if not ends_with_newline:
+        output.write('\n')
+    return output
+
+
+def to_json_line(result: TranslationResult, decoded: bool) -> str:
+    if result.error is not None:
+        return json.dumps({'from_lang': result.from_lang, 'to_lang': result.to_lang, 'from_word': result.word,
+                           'error': f'{type(result.error).__name__}: {result.error}'}, ensure_ascii=decoded)
+    translation: Translation = result.translation
+    return translation.to_json_decoded(None) if decoded else translation.to_json_encoded(None)
+
+
+def write_table(result: TranslationResult, output, width: int | None):
+    # retrieve_console_table, or a bounded table of width characters
+    output.write(f'{result.from_lang}{result.to_lang}/{result.word}\n')
+    if result.error is not None:
+        output.write(f'{type(result.error).__name__}: {result.error}\n')
+    elif width is None:
+        output.write(retrieve_console_table(result.translation))
+    else:
+        for row in iter_bounded_console_table_rows(result.translation.entry_sections, get_bounded_lengths(width)):
+            output.write(row)
+
+
+def new_argument_parser() -> argparse.ArgumentParser:
+    parser: argparse.ArgumentParser = argparse.ArgumentParser(
+        prog='word-translator', description='translates the words of a file (or stdin) with wordreference and writes '
+                                            'one json translation per line, as the translations arrive')
+    parser.add_argument('words', nargs='?', default='-',
+                        help='file of words, one per line: a word (with --from-lang and --to-lang), a '
+                             '<from_lang>TAB<to_lang>TAB<word> triple or a <from_lang><to_lang>/<word> name; '
+                             'stdin by default')
+    parser.add_argument('-f', '--from-lang', help='lang of the plain words, e.g. es')
+    parser.add_argument('-t', '--to-lang', help='lang to translate the plain words to, e.g. en')
+    parser.add_argument('-o', '--output', help='json lines file, stdout by default')
+    parser.add_argument('-w', '--workers', type=int, default=8, help='translations fetched at the same time')
+    parser.add_argument('--resume', action='store_true',
+                        help='append to --output, skipping the words already translated in it')
+    parser.add_argument('--decoded', action='store_true', help='write decoded json instead of encoded json')
+    parser.add_argument('--ordered', action='store_true',
+                        help='write in the order of the words instead of as the translations arrive')
+    parser.add_argument('--table', action='store_true', help='write console tables instead of json lines')
+    parser.add_argument('--width', type=int,
+                        help='with --table, tables of this width, cutting longer cells, instead of as wide as needed')
+    parser.add_argument('--pack', action='append', default=[], help='translation pack to look up first, repeatable')
+    parser.add_argument('--html-cache', help='sqlite file caching the fetched pages')
+    parser.add_argument('--backend', default='python', help='parser backend: python, html.parser or lxml')
+    parser.add_argument('--base-url', default=CONST_BASE_URL,
+                        help='site to fetch the pages from, a wordreference mirror or a test server')
+    parser.add_argument('--connect-timeout', type=float, default=5.0, help='seconds to wait for a connection')
+    parser.add_argument('--read-timeout', type=float, default=30.0, help='seconds to wait for the page to arrive')
+    return parser
+
+
+def main(argv: list | None = None) -> int:
+    # the exit status is 1 when some line could not be read or some word translated, 2 for wrong arguments
+    parser: argparse.ArgumentParser = new_argument_parser()
+    args = parser.parse_args(argv)
+    if (args.from_lang is None) != (args.to_lang is None):
+        parser.error('--from-lang and --to-lang go together')
+    if args.resume and (args.output is None or args.table):
+        parser.error('--resume needs a json lines --output')
+    if args.workers < 1:
+        parser.error('--workers must be at least 1')
+    if args.connect_timeout <= 0 or args.read_timeout <= 0:
+        parser.error('--connect-timeout and --read-timeout must be positive')
+    try:
+        get_parser_backend(args.backend)
+        if args.width is not None:
+            get_bounded_lengths(args.width)
+    except ValueError as error:
+        parser.error(str(error))
+    done: set = read_done_lookups(args.output) if args.resume else set()
+    errors: int = 0
+    rejected: [str] = []
+    # everything opened so far is closed when opening the next one fails
+    with ExitStack() as stack:
+        words = sys.stdin if args.words == '-' else stack.enter_context(open(args.words, encoding='utf-8'))
+        output = open_output(args.output, args.resume)
+        if output is sys.stdout:
+            stack.callback(output.flush)
+        else:
+            stack.enter_context(output)
+        packs: [TranslationPack] = [stack.enter_context(TranslationPack(path)) for path in args.pack]
+        html_cache: HtmlCache | None = None
+        if args.html_cache:
+            html_cache = HtmlCache(args.html_cache)
+            stack.callback(html_cache.close)
+        client: TranslatorClient = stack.enter_context(TranslatorClient(
+            base_url=args.base_url, connect_timeout=args.connect_timeout, read_timeout=args.read_timeout,
+            pool_maxsize=args.workers, html_cache=html_cache, packs=packs, parser_backend=args.backend))
+        for result in retrieve_translations(iter_word_lookups(words, args.from_lang, args.to_lang, done, rejected),
+                                            workers=args.workers, ordered=args.ordered, client=client):
+            if args.table:
+                write_table(result, output, args.width)
+            else:
+                output.write(to_json_line(result, args.decoded))
+                output.write('\n')
+            if result.error is not None:
+                errors += 1
+                print(f'{result.from_lang}{result.to_lang}/{result.word}: {result.error}', file=sys.stderr)
+    return 1 if errors or rejected else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
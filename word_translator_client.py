@@ -1,31 +1,141 @@
 __author__ = 'Guillermo Rodolfo Ellison'
 
-import json
+import codecs
+import re
+import struct
+import sys
+import threading
+import time
+from array import array
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from functools import lru_cache
+from html.parser import HTMLParser
+from itertools import accumulate
+from json.encoder import encode_basestring_ascii
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+try:
+    from lxml import etree
+except ImportError:
+    etree = None
 
 CONST_POS2 = "'POS2'"
 CONST_TD1 = "<td"
 CONST_TD2 = "</td>"
 CONST_TO_WRD = "'ToWrd'"
 CONST_FR_WRD = "'FrWrd'"
+CONST_ARTICLE_WRD = "'articleWRD'"
+CONST_COLLINS_DIV = "id='collinsdiv'"
+# wide enough for every replacement of normalize_html that can straddle a cut of the raw page
+CONST_TRIM_MARGIN = 256
+CONST_BASE_URL = 'https://www.wordreference.com'
+CONST_CHUNK_SIZE = 16384
+CONST_BINARY_MAGIC = b'WTR'
+CONST_BINARY_VERSION = 1
+# magic, version, array typecode, string count, field count, list count
+CONST_BINARY_HEADER = struct.Struct('<3sBcIII')
+# a surrogate pair first, so that it becomes the one character it stands for
+CONST_UNICODE_ESCAPE = re.compile(r'\\u(d[89ab][0-9a-f]{2})\\u(d[c-f][0-9a-f]{2})|\\u([0-9a-f]{4})', re.IGNORECASE)
+# what json.dumps escapes and encode_from_unicode_escape does not turn back into the character
+CONST_JSON_ESCAPES = {ord('"'): '\\"', ord('\\'): '\\\\', ord('\n'): '\\n', ord('\r'): '\\r', ord('\t'): '\\t',
+                      ord('\b'): '\\b', ord('\f'): '\\f'}
+
+
+def decode_unicode_escape(match: re.Match) -> str:
+    if match.group(3) is not None:
+        return chr(int(match.group(3), 16))
+    return chr(0x10000 + (int(match.group(1), 16) - 0xd800 << 10) + int(match.group(2), 16) - 0xdc00)
 
 
 def encode_from_unicode_escape(s: str) -> str:
-    while '\\u' in s:
-        ind = s.index('\\u')
-        s = s[0:ind] + s[ind:ind + 6].encode('utf-8').decode('unicode-escape') + s[ind + 6:]
-    return s
+    return CONST_UNICODE_ESCAPE.sub(decode_unicode_escape, s)
 
 
 def json_dumps(s: str) -> str:
-    return json.dumps(s)[1:-1]
+    return encode_basestring_ascii(s)[1:-1]
+
+
+@lru_cache(maxsize=4096)
+def decode_vocabulary(s: str) -> str:
+    # json_dumps of the few grammar, tone, note, section type and lang values, which repeat in every entry
+    return json_dumps(s)
+
+
+def encode_json_string(s: str) -> str:
+    # the same as encode_from_unicode_escape(json.dumps(s)), without escaping and unescaping the other characters
+    return '"' + s.translate(CONST_JSON_ESCAPES) + '"'
+
+
+# every metric given to the hooks, once per page or translation: the *_seconds ones are wall times, the others counts
+CONST_METRICS = ['fetch_seconds', 'fetch_bytes', 'clean_html_seconds', 'html_chars', 'tokenize_seconds', 'tags',
+                 'parse_seconds', 'entry_sections', 'entry_words', 'serialize_seconds', 'serialize_chars']
+# callables hook(name, value) from add_metrics_hook; while the list is empty nothing is measured. Hooks are called
+# from the thread doing the work, and processes (as the translation_bulk workers) have hooks of their own
+metrics_hooks: list = []
+
+
+def add_metrics_hook(hook):
+    metrics_hooks.append(hook)
+
+
+def remove_metrics_hook(hook):
+    metrics_hooks.remove(hook)
+
+
+def emit_metrics(**values):
+    for hook in metrics_hooks:
+        for name, value in values.items():
+            hook(name, value)
+
+
+class MetricsRegistry:
+    # a hook keeping the count, sum, min and max of every metric, to be read with get_metrics and exported
+    def __init__(self):
+        self.lock: threading.Lock = threading.Lock()
+        self.metrics: dict = {}
+
+    def __call__(self, name: str, value: float):
+        with self.lock:
+            metric: dict | None = self.metrics.get(name)
+            if metric is None:
+                self.metrics[name] = {'count': 1, 'sum': value, 'min': value, 'max': value}
+                return
+            metric['count'] += 1
+            metric['sum'] += value
+            if value < metric['min']:
+                metric['min'] = value
+            if value > metric['max']:
+                metric['max'] = value
+
+    def get_metrics(self) -> dict:
+        with self.lock:
+            return {name: dict(metric) for name, metric in self.metrics.items()}
+
+    def reset(self):
+        with self.lock:
+            self.metrics = {}
+
+
+# the model classes use __slots__ and intern the small vocabulary fields (langs, grammar, tone, note, section type),
+# whose few distinct values repeat in every entry
+
+
+def intern_field(value):
+    # sys.intern for the str fields; None, which the constructors have always accepted for the optional fields, and
+    # other values are kept as they are
+    return sys.intern(value) if type(value) is str else value
 
 
 class FromWord:
+    __slots__ = ('from_word', 'from_grammar')
+
     def __init__(self, from_word: str, from_grammar: str):
         self.from_word: str = from_word
-        self.from_grammar: str = from_grammar
+        self.from_grammar: str = intern_field(from_grammar)
 
     def to_dict_encoded(self) -> dict:
         return {'from_word': self.from_word, 'from_grammar': self.from_grammar}
@@ -35,10 +145,12 @@ class FromWord:
 
 
 class ToWord:
+    __slots__ = ('to_word', 'to_grammar', 'note')
+
     def __init__(self, to_word: str, to_grammar: str, note: str):
         self.to_word: str = to_word
-        self.to_grammar: str = to_grammar
-        self.note: str = note
+        self.to_grammar: str = intern_field(to_grammar)
+        self.note: str = intern_field(note)
 
     def to_dict_encoded(self) -> dict:
         return {'to_word': self.to_word, 'to_grammar': self.to_grammar, 'note': self.note}
@@ -49,11 +161,13 @@ class ToWord:
 
 
 class EntryWord:
+    __slots__ = ('from_word', 'to_words', 'tone', 'context', 'from_examples', 'to_examples')
+
     def __init__(self, from_word: FromWord, to_words: [ToWord], tone: str, context: str, from_examples: [str],
                  to_examples: [str]):
         self.from_word: FromWord = from_word
         self.to_words: [ToWord] = to_words
-        self.tone: str = tone
+        self.tone: str = intern_field(tone)
         self.context: str = context
         self.from_examples: [str] = from_examples
         self.to_examples: [str] = to_examples
@@ -82,8 +196,10 @@ class EntryWord:
 
 
 class EntrySection:
+    __slots__ = ('section_type', 'entry_words')
+
     def __init__(self, section_type: str, entry_words: [EntryWord]):
-        self.section_type: str = section_type
+        self.section_type: str = intern_field(section_type)
         self.entry_words: [EntryWord] = entry_words
 
     def to_dict_encoded(self) -> dict:
@@ -98,9 +214,11 @@ class EntrySection:
 
 
 class Translation:
+    __slots__ = ('from_lang', 'to_lang', 'from_word', 'entry_sections')
+
     def __init__(self, from_lang: str, to_lang: str, from_word: str, entry_sections: [EntrySection]):
-        self.from_lang: str = from_lang
-        self.to_lang: str = to_lang
+        self.from_lang: str = intern_field(from_lang)
+        self.to_lang: str = intern_field(to_lang)
         self.from_word: str = from_word
         self.entry_sections: [EntrySection] = entry_sections
 
@@ -123,60 +241,429 @@ class Translation:
         }
 
     def to_json_decoded(self, indent: None | int | str = 2) -> str:
-        return json.dumps(self.to_dict_encoded(), indent=indent)
+        return translation_to_json(self, indent, True)
+
+    def to_json_encoded(self, indent: None | int | str = 2) -> str:
+        return translation_to_json(self, indent, False)
+
+    def write_json_decoded(self, file, indent: None | int | str = 2):
+        write_translation_json(self, file, indent, True)
+
+    def write_json_encoded(self, file, indent: None | int | str = 2):
+        write_translation_json(self, file, indent, False)
+
+    def to_bytes(self) -> bytes:
+        return translation_to_bytes(self)
+
+    @staticmethod
+    def from_bytes(data: bytes) -> 'Translation':
+        return translation_from_bytes(data)
+
+    def __reduce__(self):
+        return translation_from_bytes, (translation_to_bytes(self),)
+
+
+class JsonWriter:
+    # appends the text of json.dumps(translation.to_dict_encoded(), indent=indent) to a list of parts, without
+    # building the dicts; decoded escapes every non ascii character as json.dumps does, encoded leaves them as they are
+    def __init__(self, indent: None | int | str = 2, decoded: bool = False):
+        self.encode = encode_basestring_ascii if decoded else encode_json_string
+        if indent is None:
+            self.newlines: [str] = [''] * 8
+            self.separators: [str] = [', '] * 8
+        else:
+            indent = ' ' * indent if isinstance(indent, int) else indent
+            self.newlines = ['\n' + indent * level for level in range(8)]
+            self.separators = [',' + newline for newline in self.newlines]
+
+    def append_strings(self, parts: [str], strings: [str], level: int):
+        if not strings:
+            parts.append('[]')
+            return
+        encode = self.encode
+        parts.append('[' + self.newlines[level + 1])
+        parts.append(self.separators[level + 1].join([encode(string) for string in strings]))
+        parts.append(self.newlines[level] + ']')
+
+    def append_to_word(self, parts: [str], to_word: ToWord, level: int):
+        encode = self.encode
+        newline: str = self.newlines[level + 1]
+        separator: str = self.separators[level + 1]
+        parts.append('{' + newline + '"to_word": ' + encode(to_word.to_word) + separator + '"to_grammar": ' +
+                     encode(to_word.to_grammar) + separator + '"note": ' + encode(to_word.note) +
+                     self.newlines[level] + '}')
+
+    def append_entry_word(self, parts: [str], entry_word: EntryWord, level: int):
+        encode = self.encode
+        newline: str = self.newlines[level + 1]
+        separator: str = self.separators[level + 1]
+        inner_newline: str = self.newlines[level + 2]
+        inner_separator: str = self.separators[level + 2]
+        parts.append('{' + newline + '"from_word": {' + inner_newline + '"from_word": ' +
+                     encode(entry_word.from_word.from_word) + inner_separator + '"from_grammar": ' +
+                     encode(entry_word.from_word.from_grammar) + newline + '}' + separator + '"tone": ' +
+                     encode(entry_word.tone) + separator + '"context": ' + encode(entry_word.context) + separator +
+                     '"to_words": ')
+        if entry_word.to_words:
+            parts.append('[' + inner_newline)
+            for ind, to_word in enumerate(entry_word.to_words):
+                if ind:
+                    parts.append(inner_separator)
+                self.append_to_word(parts, to_word, level + 2)
+            parts.append(newline + ']')
+        else:
+            parts.append('[]')
+        parts.append(separator + '"from_examples": ')
+        self.append_strings(parts, entry_word.from_examples, level + 1)
+        parts.append(separator + '"to_examples": ')
+        self.append_strings(parts, entry_word.to_examples, level + 1)
+        parts.append(self.newlines[level] + '}')
+
+    def append_entry_section(self, parts: [str], entry_section: EntrySection, level: int):
+        newline: str = self.newlines[level + 1]
+        parts.append('{' + newline + '"section_type": ' + self.encode(entry_section.section_type) +
+                     self.separators[level + 1] + '"entry_words": ')
+        if entry_section.entry_words:
+            parts.append('[' + self.newlines[level + 2])
+            for ind, entry_word in enumerate(entry_section.entry_words):
+                if ind:
+                    parts.append(self.separators[level + 2])
+                self.append_entry_word(parts, entry_word, level + 2)
+            parts.append(newline + ']')
+        else:
+            parts.append('[]')
+        parts.append(self.newlines[level] + '}')
+
+    def append_translation(self, parts: [str], translation: Translation):
+        encode = self.encode
+        separator: str = self.separators[1]
+        parts.append('{' + self.newlines[1] + '"from_lang": ' + encode(translation.from_lang) + separator +
+                     '"to_lang": ' + encode(translation.to_lang) + separator + '"from_word": ' +
+                     encode(translation.from_word) + separator + '"entry_sections": ')
+        if translation.entry_sections:
+            parts.append('[' + self.newlines[2])
+            for ind, entry_section in enumerate(translation.entry_sections):
+                if ind:
+                    parts.append(self.separators[2])
+                self.append_entry_section(parts, entry_section, 2)
+            parts.append(self.newlines[1] + ']')
+        else:
+            parts.append('[]')
+        parts.append(self.newlines[0] + '}')
+
+
+def translation_to_json(translation: Translation, indent: None | int | str = 2, decoded: bool = False) -> str:
+    parts: [str] = []
+    if not metrics_hooks:
+        JsonWriter(indent, decoded).append_translation(parts, translation)
+        return ''.join(parts)
+    start: float = time.perf_counter()
+    JsonWriter(indent, decoded).append_translation(parts, translation)
+    text: str = ''.join(parts)
+    emit_metrics(serialize_seconds=time.perf_counter() - start, serialize_chars=len(text))
+    return text
+
+
+def write_translation_json(translation: Translation, file, indent: None | int | str = 2, decoded: bool = False):
+    file.write(translation_to_json(translation, indent, decoded))
+
+
+def write_translations_json_lines(translations, file, decoded: bool = False) -> int:
+    # one line and one write per translation, so a large batch never has to be held in memory
+    count: int = 0
+    writer: JsonWriter = JsonWriter(None, decoded)
+    parts: [str] = []
+    for translation in translations:
+        start: float = time.perf_counter() if metrics_hooks else 0.0
+        writer.append_translation(parts, translation)
+        parts.append('\n')
+        text: str = ''.join(parts)
+        if metrics_hooks:
+            emit_metrics(serialize_seconds=time.perf_counter() - start, serialize_chars=len(text))
+        file.write(text)
+        parts.clear()
+        count += 1
+    return count
+
+
+def translation_to_bytes(translation: Translation) -> bytes:
+    # a header, then three arrays: the character length of every distinct string, the string index of every field in
+    # reading order and the length of every list; then the utf-8 text of the distinct strings. The arrays use the
+    # smallest typecode that holds their values, little endian
+    ids: dict = {}
+    fields: [int] = [ids.setdefault(translation.from_lang, len(ids)), ids.setdefault(translation.to_lang, len(ids)),
+                     ids.setdefault(translation.from_word, len(ids))]
+    counts: [int] = [len(translation.entry_sections)]
+    for entry_section in translation.entry_sections:
+        fields.append(ids.setdefault(entry_section.section_type, len(ids)))
+        counts.append(len(entry_section.entry_words))
+        for entry_word in entry_section.entry_words:
+            fields.append(ids.setdefault(entry_word.from_word.from_word, len(ids)))
+            fields.append(ids.setdefault(entry_word.from_word.from_grammar, len(ids)))
+            fields.append(ids.setdefault(entry_word.tone, len(ids)))
+            fields.append(ids.setdefault(entry_word.context, len(ids)))
+            for to_word in entry_word.to_words:
+                fields.append(ids.setdefault(to_word.to_word, len(ids)))
+                fields.append(ids.setdefault(to_word.to_grammar, len(ids)))
+                fields.append(ids.setdefault(to_word.note, len(ids)))
+            fields.extend([ids.setdefault(from_example, len(ids)) for from_example in entry_word.from_examples])
+            fields.extend([ids.setdefault(to_example, len(ids)) for to_example in entry_word.to_examples])
+            counts.append(len(entry_word.to_words))
+            counts.append(len(entry_word.from_examples))
+            counts.append(len(entry_word.to_examples))
+    lengths: [int] = [len(string) for string in ids]
+    largest: int = max(len(ids), max(lengths), max(counts))
+    typecode: str = 'B' if largest < 1 << 8 else 'H' if largest < 1 << 16 else 'I'
+    arrays: [array] = [array(typecode, lengths), array(typecode, fields), array(typecode, counts)]
+    if sys.byteorder == 'big':
+        for values in arrays:
+            values.byteswap()
+    return b''.join([
+        CONST_BINARY_HEADER.pack(CONST_BINARY_MAGIC, CONST_BINARY_VERSION, typecode.encode('ascii'), len(lengths),
+                                 len(fields), len(counts)),
+        *[values.tobytes() for values in arrays], ''.join(ids).encode('utf-8', 'surrogatepass')])
+
+
+def translation_from_bytes(data: bytes) -> Translation:
+    magic, version, typecode, string_count, field_count, count_count = CONST_BINARY_HEADER.unpack_from(data)
+    if magic != CONST_BINARY_MAGIC:
+        raise ValueError('not a binary translation record')
+    if version != CONST_BINARY_VERSION:
+        raise ValueError(f'unsupported binary translation version {version}')
+    data = memoryview(data)
+    arrays: [array] = []
+    end: int = CONST_BINARY_HEADER.size
+    for size in (string_count, field_count, count_count):
+        values: array = array(typecode.decode('ascii'))
+        start, end = end, end + size * values.itemsize
+        values.frombytes(data[start:end])
+        if sys.byteorder == 'big':
+            values.byteswap()
+        arrays.append(values)
+    text: str = str(data[end:], 'utf-8', 'surrogatepass')
+    ends: [int] = list(accumulate(arrays[0]))
+    strings: [str] = [text[start:end] for start, end in zip([0, *ends], ends)]
+    fields: [str] = list(map(strings.__getitem__, arrays[1]))
+    next_count = iter(arrays[2].tolist()).__next__
+    # the objects are built without their constructors, interning the vocabulary fields as they do
+    new = object.__new__
+    intern = sys.intern
+    position: int = 3
+    entry_sections: [EntrySection] = []
+    for _ in range(next_count()):
+        entry_section: EntrySection = new(EntrySection)
+        entry_section.section_type = intern(fields[position])
+        entry_section.entry_words = entry_words = []
+        position += 1
+        for _ in range(next_count()):
+            entry_word: EntryWord = new(EntryWord)
+            entry_word.from_word = from_word = new(FromWord)
+            from_word.from_word = fields[position]
+            from_word.from_grammar = intern(fields[position + 1])
+            entry_word.tone = intern(fields[position + 2])
+            entry_word.context = fields[position + 3]
+            position += 4
+            end = position + 3 * next_count()
+            entry_word.to_words = to_words = []
+            for ind in range(position, end, 3):
+                to_word: ToWord = new(ToWord)
+                to_word.to_word = fields[ind]
+                to_word.to_grammar = intern(fields[ind + 1])
+                to_word.note = intern(fields[ind + 2])
+                to_words.append(to_word)
+            position, end = end, end + next_count()
+            entry_word.from_examples = fields[position:end]
+            position, end = end, end + next_count()
+            entry_word.to_examples = fields[position:end]
+            position = end
+            entry_words.append(entry_word)
+        entry_sections.append(entry_section)
+    translation: Translation = new(Translation)
+    translation.from_lang = intern(fields[0])
+    translation.to_lang = intern(fields[1])
+    translation.from_word = fields[2]
+    translation.entry_sections = entry_sections
+    return translation
 
-    def to_json_encoded(self, indent: None | int = 2) -> str:
-        return encode_from_unicode_escape(self.to_json_decoded(indent))
 
+class DecodedFromWord:
+    # the decoded views escape each field as json_dumps does on first access and keep the result; they read the
+    # encoded object they were made from, which must not change afterwards
+    __slots__ = ('encoded', 'decoded_from_word')
 
-def to_decoded_from_word(from_word: FromWord) -> FromWord:
-    decoded_from_word: FromWord = FromWord(
-        from_word=json_dumps(from_word.from_word),
-        from_grammar=json_dumps(from_word.from_grammar)
-    )
-    return decoded_from_word
+    def __init__(self, encoded: FromWord):
+        self.encoded: FromWord = encoded
+        self.decoded_from_word: str | None = None
 
+    @property
+    def from_word(self) -> str:
+        if self.decoded_from_word is None:
+            self.decoded_from_word = json_dumps(self.encoded.from_word)
+        return self.decoded_from_word
 
-def to_decoded_to_word(to_word: ToWord) -> ToWord:
-    decoded_to_word: ToWord = ToWord(
-        to_word=json_dumps(to_word.to_word),
-        to_grammar=json_dumps(to_word.to_grammar),
-        note=json_dumps(to_word.note)
-    )
-    return decoded_to_word
+    @property
+    def from_grammar(self) -> str:
+        return decode_vocabulary(self.encoded.from_grammar)
 
+    to_dict_encoded = FromWord.to_dict_encoded
+    to_dict_decoded = FromWord.to_dict_decoded
 
-def to_decoded_entry_word(entry_word: EntryWord) -> EntryWord:
-    to_word: ToWord
-    decoded_entry_word: EntryWord = EntryWord(
-        from_word=to_decoded_from_word(entry_word.from_word),
-        to_words=[to_decoded_to_word(to_word) for to_word in entry_word.to_words],
-        tone=json_dumps(entry_word.tone),
-        context=json_dumps(entry_word.context),
-        from_examples=[json_dumps(from_example) for from_example in entry_word.from_examples],
-        to_examples=[json_dumps(to_example) for to_example in entry_word.to_examples]
-    )
-    return decoded_entry_word
 
+class DecodedToWord:
+    __slots__ = ('encoded', 'decoded_to_word')
 
-def to_decoded_entry_section(entry_section: EntrySection) -> EntrySection:
-    entry_word: EntryWord
-    decoded_entry_section: EntrySection = EntrySection(
-        section_type=json_dumps(entry_section.section_type),
-        entry_words=[to_decoded_entry_word(entry_word) for entry_word in entry_section.entry_words]
-    )
-    return decoded_entry_section
+    def __init__(self, encoded: ToWord):
+        self.encoded: ToWord = encoded
+        self.decoded_to_word: str | None = None
 
+    @property
+    def to_word(self) -> str:
+        if self.decoded_to_word is None:
+            self.decoded_to_word = json_dumps(self.encoded.to_word)
+        return self.decoded_to_word
 
-def to_decoded_translation(translation: Translation) -> Translation:
-    entry_section: EntrySection
-    decoded_translation: Translation = Translation(
-        from_lang=json_dumps(translation.from_lang),
-        to_lang=json_dumps(translation.to_lang),
-        from_word=json_dumps(translation.from_word),
-        entry_sections=[to_decoded_entry_section(entry_section) for entry_section in translation.entry_sections]
-    )
-    return decoded_translation
+    @property
+    def to_grammar(self) -> str:
+        return decode_vocabulary(self.encoded.to_grammar)
+
+    @property
+    def note(self) -> str:
+        return decode_vocabulary(self.encoded.note)
+
+    to_dict_encoded = ToWord.to_dict_encoded
+    to_dict_decoded = ToWord.to_dict_decoded
+
+
+class DecodedEntryWord:
+    __slots__ = ('encoded', 'decoded_from_word', 'decoded_to_words', 'decoded_context', 'decoded_from_examples',
+                 'decoded_to_examples')
+
+    def __init__(self, encoded: EntryWord):
+        self.encoded: EntryWord = encoded
+        self.decoded_from_word: DecodedFromWord | None = None
+        self.decoded_to_words: [DecodedToWord] | None = None
+        self.decoded_context: str | None = None
+        self.decoded_from_examples: [str] | None = None
+        self.decoded_to_examples: [str] | None = None
+
+    @property
+    def from_word(self) -> DecodedFromWord:
+        if self.decoded_from_word is None:
+            self.decoded_from_word = DecodedFromWord(self.encoded.from_word)
+        return self.decoded_from_word
+
+    @property
+    def to_words(self) -> [DecodedToWord]:
+        to_word: ToWord
+        if self.decoded_to_words is None:
+            self.decoded_to_words = [DecodedToWord(to_word) for to_word in self.encoded.to_words]
+        return self.decoded_to_words
+
+    @property
+    def tone(self) -> str:
+        return decode_vocabulary(self.encoded.tone)
+
+    @property
+    def context(self) -> str:
+        if self.decoded_context is None:
+            self.decoded_context = json_dumps(self.encoded.context)
+        return self.decoded_context
+
+    @property
+    def from_examples(self) -> [str]:
+        if self.decoded_from_examples is None:
+            self.decoded_from_examples = [json_dumps(from_example) for from_example in self.encoded.from_examples]
+        return self.decoded_from_examples
+
+    @property
+    def to_examples(self) -> [str]:
+        if self.decoded_to_examples is None:
+            self.decoded_to_examples = [json_dumps(to_example) for to_example in self.encoded.to_examples]
+        return self.decoded_to_examples
+
+    to_dict_encoded = EntryWord.to_dict_encoded
+    to_dict_decoded = EntryWord.to_dict_decoded
+
+
+class DecodedEntrySection:
+    __slots__ = ('encoded', 'decoded_entry_words')
+
+    def __init__(self, encoded: EntrySection):
+        self.encoded: EntrySection = encoded
+        self.decoded_entry_words: [DecodedEntryWord] | None = None
+
+    @property
+    def section_type(self) -> str:
+        return decode_vocabulary(self.encoded.section_type)
+
+    @property
+    def entry_words(self) -> [DecodedEntryWord]:
+        entry_word: EntryWord
+        if self.decoded_entry_words is None:
+            self.decoded_entry_words = [DecodedEntryWord(entry_word) for entry_word in self.encoded.entry_words]
+        return self.decoded_entry_words
+
+    to_dict_encoded = EntrySection.to_dict_encoded
+    to_dict_decoded = EntrySection.to_dict_decoded
+
+
+class DecodedTranslation:
+    __slots__ = ('encoded', 'decoded_from_word', 'decoded_entry_sections')
+
+    def __init__(self, encoded: Translation):
+        self.encoded: Translation = encoded
+        self.decoded_from_word: str | None = None
+        self.decoded_entry_sections: [DecodedEntrySection] | None = None
+
+    @property
+    def from_lang(self) -> str:
+        return decode_vocabulary(self.encoded.from_lang)
+
+    @property
+    def to_lang(self) -> str:
+        return decode_vocabulary(self.encoded.to_lang)
+
+    @property
+    def from_word(self) -> str:
+        if self.decoded_from_word is None:
+            self.decoded_from_word = json_dumps(self.encoded.from_word)
+        return self.decoded_from_word
+
+    @property
+    def entry_sections(self) -> [DecodedEntrySection]:
+        entry_section: EntrySection
+        if self.decoded_entry_sections is None:
+            self.decoded_entry_sections = [
+                DecodedEntrySection(entry_section) for entry_section in self.encoded.entry_sections]
+        return self.decoded_entry_sections
+
+    to_dict_encoded = Translation.to_dict_encoded
+    to_dict_decoded = Translation.to_dict_decoded
+    to_json_decoded = Translation.to_json_decoded
+    to_json_encoded = Translation.to_json_encoded
+    write_json_decoded = Translation.write_json_decoded
+    write_json_encoded = Translation.write_json_encoded
+
+
+def to_decoded_from_word(from_word: FromWord) -> DecodedFromWord:
+    return DecodedFromWord(from_word)
+
+
+def to_decoded_to_word(to_word: ToWord) -> DecodedToWord:
+    return DecodedToWord(to_word)
+
+
+def to_decoded_entry_word(entry_word: EntryWord) -> DecodedEntryWord:
+    return DecodedEntryWord(entry_word)
+
+
+def to_decoded_entry_section(entry_section: EntrySection) -> DecodedEntrySection:
+    return DecodedEntrySection(entry_section)
+
+
+def to_decoded_translation(translation: Translation) -> DecodedTranslation:
+    # a new view on every call, which the caller keeps for as long as it wants the escaped fields reused
+    return DecodedTranslation(translation)
 
 
 def next_attribute(attribute: str, html_classes: str, quote: str):
@@ -221,33 +708,211 @@ def find_data_phs_2(html_classes: str, quote: str) -> [str]:
     return data_phs
 
 
+def find_attributes(html: str, start: int = 0, end: int = -1):
+    # one scan over the '=' of the tag header html[start:end], keeping a cursor per attribute and quote so the
+    # values come out as the sequential class="/class='/data-ph="/data-ph=' searches would return them
+    end = len(html) if end < 0 else end
+    classes_dq: [str] = []
+    classes_sq: [str] = []
+    data_phs_dq: [str] = []
+    data_phs_sq: [str] = []
+    cursors: dict = {}
+    ind = html.find('=', start, end)
+    while ind != -1:
+        quote = html[ind + 1] if ind + 1 < end else ''
+        if quote == '"' or quote == "'":
+            if ind - 5 >= start and html.startswith('class', ind - 5, ind):
+                attribute, target = 'class', classes_dq if quote == '"' else classes_sq
+            elif ind - 7 >= start and html.startswith('data-ph', ind - 7, ind):
+                attribute, target = 'data-ph', data_phs_dq if quote == '"' else data_phs_sq
+            else:
+                attribute, target = None, None
+            if attribute and ind - len(attribute) >= cursors.get((attribute, quote), start):
+                ind1 = html.index(quote, ind + 2, end)
+                value = html[ind + 2:ind1]
+                if value or ind1 + 1 < end:
+                    target.append(value)
+                cursors[(attribute, quote)] = ind1 + 1
+        ind = html.find('=', ind + 1, end)
+    classes_dq.extend(classes_sq)
+    data_phs_dq.extend(data_phs_sq)
+    return classes_dq, data_phs_dq
+
+
 def find_classes(html_classes: str) -> [str]:
-    classes: [str] = find_classes_2(html_classes, '"')
-    classes.extend(find_classes_2(html_classes, "'"))
-    return classes
+    return find_attributes(html_classes)[0]
 
 
 def find_data_phs(html_classes: str) -> [str]:
-    data_phs: [str] = find_data_phs_2(html_classes, '"')
-    data_phs.extend(find_data_phs_2(html_classes, "'"))
-    return data_phs
+    return find_attributes(html_classes)[1]
 
 
 def next_tag_content(html: str):
-    ind0 = html.index('>') if '>' in html else -1
+    ind0 = html.find('>')
     if ind0 == -1:
         return None, None, None, None
-    html_classes = html[:ind0]
-    classes: [str] = find_classes(html_classes)
-    data_phs: [str] = find_data_phs(html_classes)
-    html = html[ind0 + 1:]
-    ind1 = html.index('<') if '<' in html else -1
+    classes, data_phs = find_attributes(html, 0, ind0)
+    ind1 = html.find('<', ind0 + 1)
     if ind1 == -1:
         return None, classes, data_phs, None
-    content = html[:ind1].strip()
+    content = html[ind0 + 1:ind1].strip()
     content = None if len(content) == 0 else content
-    html = html[ind1 + 1:]
-    return html, classes, data_phs, content
+    return html[ind1 + 1:], classes, data_phs, content
+
+
+def iter_tag_contents(html: str):
+    # same (classes, data_phs, content) stream as chaining next_tag_content, but over one buffer with a cursor; a
+    # tag is only yielded when some html remains after it, as retrieve_translation never reads the last one
+    end: int = len(html)
+    pos: int = 0
+    while True:
+        ind0 = html.find('>', pos)
+        if ind0 == -1:
+            return
+        classes, data_phs = find_attributes(html, pos, ind0)
+        ind1 = html.find('<', ind0 + 1)
+        if ind1 == -1 or ind1 + 1 >= end:
+            return
+        pos = ind1 + 1
+        content = html[ind0 + 1:ind1].strip()
+        yield classes, data_phs, None if len(content) == 0 else content
+
+
+class TagBoundsParser(HTMLParser):
+    # records the (start, end) of every tag, comment and declaration of html, so that their headers and the contents
+    # between them can be sliced from html as written, character references included
+    def __init__(self, html: str):
+        super().__init__(convert_charrefs=False)
+        self.html: str = html
+        self.line_starts: [int] = [0]
+        ind = html.find('\n')
+        while ind != -1:
+            self.line_starts.append(ind + 1)
+            ind = html.find('\n', ind + 1)
+        self.bounds: [(int, int)] = []
+
+    def get_offset(self) -> int:
+        line, column = self.getpos()
+        return self.line_starts[line - 1] + column
+
+    def handle_starttag(self, tag: str, attrs: list):
+        start: int = self.get_offset()
+        self.bounds.append((start, start + len(self.get_starttag_text())))
+
+    def handle_startendtag(self, tag: str, attrs: list):
+        self.handle_starttag(tag, attrs)
+
+    def handle_endtag(self, tag: str):
+        start: int = self.get_offset()
+        end: int = self.html.find('>', start)
+        self.bounds.append((start, len(self.html) if end == -1 else end + 1))
+
+    def handle_comment(self, data: str):
+        self.handle_endtag(data)
+
+    def handle_decl(self, decl: str):
+        self.handle_endtag(decl)
+
+    def handle_pi(self, data: str):
+        self.handle_endtag(data)
+
+    def unknown_decl(self, data: str):
+        self.handle_endtag(data)
+
+
+def iter_tag_contents_html_parser(html: str):
+    # the iter_tag_contents stream with the tags found by html.parser; the partial header the cleaned html starts
+    # with is split off first, as html.parser would read it as text
+    ind0 = html.find('>')
+    if ind0 == -1:
+        return
+    base: int = ind0 + 1
+    parser: TagBoundsParser = TagBoundsParser(html[base:])
+    parser.feed(parser.html)
+    parser.close()
+    header_start: int = 0
+    header_end: int = ind0
+    content_start: int = base
+    for start, end in parser.bounds:
+        start += base
+        if start + 1 >= len(html):
+            return
+        classes, data_phs = find_attributes(html, header_start, header_end)
+        content = html[content_start:start].strip()
+        yield classes, data_phs, None if len(content) == 0 else content
+        header_start, header_end, content_start = start + 1, end + base - 1, end + base
+    # what follows the last tag, up to a '<' that html.parser did not take for a tag, as the cursor would read it
+    start = html.find('<', content_start)
+    if start != -1 and start + 1 < len(html):
+        classes, data_phs = find_attributes(html, header_start, header_end)
+        content = html[content_start:start].strip()
+        yield classes, data_phs, None if len(content) == 0 else content
+
+
+class LxmlTagContentTarget:
+    # an lxml parser target turning start, end and comment events into (classes, data_phs, content) of the tag they
+    # close; the html and body elements lxml adds around the fragment are left out
+    def __init__(self, classes: [str], data_phs: [str]):
+        self.tag_contents: [([str], [str], str | None)] = []
+        self.classes: [str] = classes
+        self.data_phs: [str] = data_phs
+        self.texts: [str] = []
+
+    def add_tag(self, classes: [str], data_phs: [str]):
+        content = ''.join(self.texts).strip()
+        self.tag_contents.append((self.classes, self.data_phs, None if len(content) == 0 else content))
+        self.classes = classes
+        self.data_phs = data_phs
+        self.texts = []
+
+    def start(self, tag: str, attrib: dict):
+        if tag != 'html' and tag != 'body':
+            html_class: str | None = attrib.get('class')
+            data_ph: str | None = attrib.get('data-ph')
+            self.add_tag([] if html_class is None else [html_class], [] if data_ph is None else [data_ph])
+
+    def end(self, tag: str):
+        if tag != 'html' and tag != 'body':
+            self.add_tag([], [])
+
+    def data(self, data: str):
+        self.texts.append(data)
+
+    def comment(self, text: str):
+        self.add_tag([], [])
+
+    def close(self) -> [([str], [str], str | None)]:
+        return self.tag_contents
+
+
+def iter_tag_contents_lxml(html: str):
+    # libxml2 decodes character references and drops unmatched end tags, so compare it with compare_parser_backends
+    # on your pages before relying on it
+    ind0 = html.find('>')
+    if ind0 == -1:
+        return
+    classes, data_phs = find_attributes(html, 0, ind0)
+    parser = etree.HTMLParser(target=LxmlTagContentTarget(classes, data_phs))
+    parser.feed(html[ind0 + 1:])
+    yield from parser.close()
+
+
+# name -> function turning cleaned html into the (classes, data_phs, content) stream of iter_tag_contents
+parser_backends: dict = {'python': iter_tag_contents, 'html.parser': iter_tag_contents_html_parser}
+if etree is not None:
+    parser_backends['lxml'] = iter_tag_contents_lxml
+
+
+def register_parser_backend(name: str, iter_function):
+    parser_backends[name] = iter_function
+
+
+def get_parser_backend(name: str):
+    iter_function = parser_backends.get(name)
+    if iter_function is None:
+        raise ValueError(f'unknown or unavailable parser backend "{name}", the available ones are '
+                         f'{", ".join(parser_backends)}')
+    return iter_function
 
 
 def clean_a_tag_once(html: str, start: int):
@@ -266,11 +931,22 @@ def clean_a_tag_once(html: str, start: int):
 
 
 def clean_a_tag_all(html: str) -> str:
+    pieces: [str] = []
+    pos = 0
     start = 0
-    done, html, start = clean_a_tag_once(html, start)
-    while done:
-        done, html, start = clean_a_tag_once(html, start)
-    return html
+    while True:
+        ind0 = html.find('<a ', start)
+        if ind0 == -1:
+            break
+        ind1 = html.index('>', ind0)
+        if html.startswith('></a>', ind1):
+            pieces.append(html[pos:ind0])
+            pos = ind1 + 5
+            start = pos
+        else:
+            start = ind1 + 1
+    pieces.append(html[pos:])
+    return ''.join(pieces)
 
 
 def clean_tag_once(html: str, start: int, end: int):
@@ -298,6 +974,23 @@ def clean_tag_all(html: str, start: int, end: int):
     return html
 
 
+def strip_tags(html: str, start: int, end: int) -> str:
+    # clean_tag_all restricted to html[start:end], returned as the new text for that slice
+    pieces: [str] = []
+    pos = start
+    while True:
+        ind0 = html.find('<', pos, end)
+        if ind0 == -1:
+            break
+        ind1 = html.find('>', ind0, end)
+        if ind1 == -1:
+            break
+        pieces.append(html[pos:ind0])
+        pos = ind1 + 1
+    pieces.append(html[pos:end])
+    return ''.join(pieces)
+
+
 def clean_multi_target_once(html: str, start: int, target0: str, target1: str, target2: str,
                             include_targets: bool = False):
     done = False
@@ -319,6 +1012,38 @@ def clean_multi_target_once(html: str, start: int, target0: str, target1: str, t
     return done, html, start
 
 
+def clean_multi_target_all(html: str, target0: str, target1: str, target2: str,
+                           include_targets: bool = False) -> str:
+    pieces: [str] = []
+    pos = 0
+    start = 0
+    while True:
+        ind0 = html.find(target0, start)
+        if ind0 == -1:
+            break
+        start = ind0 if include_targets else ind0 + len(target0)
+        ind1 = html.find(target1, start)
+        ind2 = html.find(target2, start)
+        if ind1 == -1 or ind2 == -1 or ind1 > ind2:
+            # the loop over clean_multi_target_once never ends in this case when the targets are included
+            start = ind0 + len(target0)
+            continue
+        end = ind1 + len(target1) if include_targets else ind1
+        cleaned = strip_tags(html, start, end)
+        pieces.append(html[pos:start])
+        if target0 in cleaned + html[end:end + len(target0) - 1]:
+            # the next target0 comes out of the cleaned text, keep searching the rebuilt remainder
+            html = cleaned + html[end:]
+            pos = 0
+            start = 0
+            continue
+        pieces.append(cleaned)
+        pos = end
+        start = end
+    pieces.append(html[pos:])
+    return ''.join(pieces)
+
+
 def find_new_start(html: str, start: int, target0: str, target1: str) -> int:
     if target0 not in html[start:]:
         return -1
@@ -360,32 +1085,18 @@ def clean_context_all_old(html: str) -> str:
 
 
 def clean_context_all_new(html: str) -> str:
-    start = 0
-    done, html, start = clean_context_once_new(html, start)
-    while done:
-        done, html, start = clean_context_once_new(html, start)
-    return html
+    return clean_multi_target_all(html, '<span title=', '</span>', CONST_TD2, True)
 
 
 def clean_to_wrd_all(html: str) -> str:
-    start = 0
-    done, html, start = clean_to_wrd_once(html, start)
-    while done:
-        done, html, start = clean_to_wrd_once(html, start)
-    return html
+    return clean_multi_target_all(html, CONST_TO_WRD, CONST_POS2, CONST_TD2)
 
 
 def clean_fr_wrd_all(html: str) -> str:
-    start = 0
-    done, html, start = clean_fr_wrd_once(html, start)
-    while done:
-        done, html, start = clean_fr_wrd_once(html, start)
-    return html
+    return clean_multi_target_all(html, CONST_FR_WRD, CONST_POS2, CONST_TD2)
 
 
-def clean_html(html: str) -> str:
-    # GENERAL CLEAINING
-    html = html + ' '
+def normalize_html(html: str) -> str:
     html = html.replace('  ', ' ').replace('  ', ' ').replace('&nbsp;', '')
     html = html.replace('<strong>', '').replace('</strong>', '')
     html = html.replace('<STRONG>', '').replace('</STRONG>', '')
@@ -396,13 +1107,134 @@ def clean_html(html: str) -> str:
     html = html.replace('"FrWrd"', CONST_FR_WRD)
     html = html.replace('"ToWrd"', CONST_TO_WRD)
     html = html.replace('"POS2"', CONST_POS2)
-    html = html.replace('"articleWRD"', "'articleWRD'")
-    html = html.replace('id="collinsdiv"', "id='collinsdiv'")
+    html = html.replace('"articleWRD"', CONST_ARTICLE_WRD)
+    html = html.replace('id="collinsdiv"', CONST_COLLINS_DIV)
+    return html
+
+
+class HtmlTrimmer:
+    # takes the page in chunks and keeps only the raw slice that normalizes to the same text as the whole page
+    # between the articleWRD and collinsdiv markers: what comes before the article is dropped as it arrives, and
+    # feed returns True as soon as the kept text reaches far enough past a collinsdiv marker.
+    # No replacement of normalize_html matches, removes or adds a newline, so the text normalizes line by line: the
+    # lines already checked are normalized once and kept in normalized, and each collinsdiv candidate only normalizes
+    # the text after the last newline before it
+    def __init__(self):
+        self.offset: int = 0
+        self.tail: str = ''
+        self.pieces: [str] = []
+        self.length: int = 0
+        self.ind_article: int = -1
+        self.candidates: deque = deque()
+        self.window: (int, int, str) | None = None
+        # the kept text up to cut is normalized into normalized, the rest of it is pending
+        self.cut: int = 0
+        self.pending: str = ''
+        self.normalized: [str] = []
+        self.normalized_length: int = 0
+        # the position of the article marker in the normalized text, and whether a collinsdiv marker follows it there
+        self.ind_begin: int = -1
+        self.collins_found: bool = False
+
+    def get_text(self) -> str:
+        if len(self.pieces) > 1:
+            self.pieces = [''.join(self.pieces)]
+        return self.pieces[0] if self.pieces else ''
+
+    def find_markers(self, window: str, window_start: int) -> (int, bool):
+        # the article marker position and whether a collinsdiv marker follows it, in the normalized text so far
+        # followed by window, which starts at window_start
+        ind_begin: int = self.ind_begin
+        if ind_begin == -1:
+            ind_begin = window.find(CONST_ARTICLE_WRD)
+            if ind_begin == -1:
+                return -1, False
+            ind_begin += window_start
+        return ind_begin, self.collins_found or window.find(CONST_COLLINS_DIV, max(0, ind_begin - window_start)) != -1
+
+    def normalize_lines(self, end: int):
+        # moves the kept text up to the last newline before end from pending to normalized
+        ind_newline: int = self.pending.rfind('\n', 0, end - self.cut)
+        if ind_newline == -1:
+            return
+        lines: str = normalize_html(self.pending[:ind_newline + 1])
+        self.ind_begin, self.collins_found = self.find_markers(lines, self.normalized_length)
+        self.normalized.append(lines)
+        self.normalized_length += len(lines)
+        self.pending = self.pending[ind_newline + 1:]
+        self.cut += ind_newline + 1
+
+    def feed(self, chunk: str) -> bool:
+        if self.window is not None:
+            return True
+        if self.ind_article == -1:
+            text: str = self.tail + chunk
+            ind: int = text.find('articleWRD')
+            if ind == -1:
+                # enough to keep the margin before a marker that starts in the next chunk
+                self.tail = text[-(CONST_TRIM_MARGIN + len('articleWRD')):]
+                self.offset += len(text) - len(self.tail)
+                return False
+            start: int = max(0, ind - CONST_TRIM_MARGIN)
+            self.offset += start
+            self.tail = ''
+            self.ind_article = ind - start
+            chunk = text[start:]
+        region: str = self.tail + chunk
+        region_start: int = self.length - len(self.tail)
+        self.pieces.append(chunk)
+        self.pending += chunk
+        self.length += len(chunk)
+        self.tail = region[-(len('collinsdiv') - 1):]
+        ind_collins: int = region.find('collinsdiv', max(0, self.ind_article - region_start))
+        while ind_collins != -1:
+            self.candidates.append(region_start + ind_collins)
+            ind_collins = region.find('collinsdiv', ind_collins + 1)
+        while self.candidates and self.candidates[0] + CONST_TRIM_MARGIN < self.length:
+            end: int = self.candidates.popleft() + CONST_TRIM_MARGIN
+            self.normalize_lines(end)
+            rest: str = normalize_html(self.pending[:end - self.cut] + ' ')
+            if self.find_markers(rest, self.normalized_length)[1]:
+                self.pieces = [self.get_text()[:end]]
+                self.window = (self.offset, self.offset + end, ''.join(self.normalized) + rest)
+                return True
+        return False
+
+    def get_window(self) -> (int, int, str):
+        # (start, end, normalized html[start:end]) in page positions; without an article marker only the last
+        # characters of the page are kept, which clean_html rejects like the whole page
+        if self.window is None:
+            if self.ind_article == -1:
+                self.window = (self.offset, self.offset + len(self.tail), normalize_html(self.tail + ' '))
+            else:
+                self.window = (self.offset, self.offset + self.length,
+                               ''.join(self.normalized) + normalize_html(self.pending + ' '))
+        return self.window
+
+    def get_html(self) -> str:
+        start, end, _ = self.get_window()
+        return (self.get_text() if self.ind_article != -1 else self.tail)[:end - start]
+
+
+def trim_html_window(html: str):
+    trimmer: HtmlTrimmer = HtmlTrimmer()
+    trimmer.feed(html)
+    return trimmer.get_window()
+
+
+def trim_html(html: str) -> str:
+    trimmer: HtmlTrimmer = HtmlTrimmer()
+    trimmer.feed(html)
+    return trimmer.get_html()
+
+
+def clean_html(html: str) -> str:
+    # GENERAL CLEAINING
+    _, _, html = trim_html_window(html)
     # FROM Principal Translations
-    ind_begin = html.index("'articleWRD'")
-    html = html[ind_begin:]
+    html = html[html.index(CONST_ARTICLE_WRD):]
     # TO <div id='collinsdiv'
-    html = html[:html.index("id='collinsdiv'")]
+    html = html[:html.index(CONST_COLLINS_DIV)]
     # REMOVE VOID A HREF
     html = clean_a_tag_all(html)
     # REMOVE INTERNAL FR WRD TAGS
@@ -416,8 +1248,101 @@ def clean_html(html: str) -> str:
     return html
 
 
+# the classes the parser looks for, as bits of ParserState.mask
+CONST_CLASS_WRTOPSECTION = 1 << 0
+CONST_CLASS_FR_WRD = 1 << 1
+CONST_CLASS_TO_WRD = 1 << 2
+CONST_CLASS_PH = 1 << 3
+CONST_CLASS_FR_EX = 1 << 4
+CONST_CLASS_TO_EX = 1 << 5
+CONST_CLASS_TOOLTIP = 1 << 6
+CONST_CLASS_POS2 = 1 << 7
+CONST_CLASS_FR2 = 1 << 8
+CONST_CLASS_DSENSE = 1 << 9
+CONST_CLASS_BITS = {'wrtopsection': CONST_CLASS_WRTOPSECTION, 'FrWrd': CONST_CLASS_FR_WRD, 'ToWrd': CONST_CLASS_TO_WRD,
+                    'ph': CONST_CLASS_PH, 'FrEx': CONST_CLASS_FR_EX, 'ToEx': CONST_CLASS_TO_EX,
+                    'tooltip': CONST_CLASS_TOOLTIP, 'POS2': CONST_CLASS_POS2, 'Fr2': CONST_CLASS_FR2,
+                    'dsense': CONST_CLASS_DSENSE}
+
+
+@lru_cache(maxsize=1024)
+def classify_classes(classes: tuple) -> (int, int):
+    # the mask of the known classes and how many tooltip classes there are; the same few class lists repeat on
+    # every page
+    mask: int = 0
+    tooltip_count: int = 0
+    for html_class in classes:
+        mask |= CONST_CLASS_BITS.get(html_class, 0)
+        tooltip_count += html_class == 'tooltip'
+    return mask, tooltip_count
+
+
+class ParserState:
+    # classes_prev, the classes of the tags read since the last write, is kept as its mask, its length and its
+    # tooltip count; the list itself is only kept to print it with print_meta
+    __slots__ = ('print_html', 'print_meta', 'print_data', 'section_type', 'from_word', 'from_grammar',
+                 'from_grammar_found', 'to_word', 'to_grammar', 'tone', 'context', 'note', 'from_example',
+                 'to_example', 'last_recognized', 'penultimate_recognized', 'content', 'classes', 'data_phs', 'mask',
+                 'class_count', 'tooltip_count', 'classes_prev', 'tags', 'html', 'iter_tag_contents')
+
+    def __init__(self, html: str, print_html: bool, print_meta: bool, print_data: bool, backend: str = 'python'):
+        self.print_html: bool = print_html
+        self.print_meta: bool = print_meta
+        self.print_data: bool = print_data
+        self.section_type: str = ''
+        self.from_word: str = ''
+        self.from_grammar: str = ''
+        self.from_grammar_found: bool = False
+        self.to_word: str = ''
+        self.to_grammar: str = ''
+        self.tone: str = ''
+        self.context: str = ''
+        self.note: str = ''
+        self.from_example: str = ''
+        self.to_example: str = ''
+        self.last_recognized: str = ''
+        self.penultimate_recognized: str = ''
+        self.content: str | None = None
+        self.classes: [str] | None = None
+        self.data_phs: [str] | None = None
+        self.mask: int = 0
+        self.class_count: int = 0
+        self.tooltip_count: int = 0
+        self.classes_prev: [str] | None = [] if print_meta else None
+        self.tags = None
+        self.html: str = html
+        self.iter_tag_contents = get_parser_backend(backend)
+
+    def extend_classes(self, classes: [str]):
+        mask, tooltip_count = classify_classes(tuple(classes))
+        self.mask |= mask
+        self.class_count += len(classes)
+        self.tooltip_count += tooltip_count
+        if self.classes_prev is not None:
+            self.classes_prev.extend(classes)
+
+    def remove_tooltip(self):
+        self.class_count -= 1
+        self.tooltip_count -= 1
+        if not self.tooltip_count:
+            self.mask &= ~CONST_CLASS_TOOLTIP
+        if self.classes_prev is not None:
+            self.classes_prev.remove('tooltip')
+
+    def clear_classes(self):
+        self.mask = 0
+        self.class_count = 0
+        self.tooltip_count = 0
+        if self.classes_prev is not None:
+            self.classes_prev = []
+
+
+# deprecated
 def retrieve_translation_new_work(from_lang: str, to_lang: str, word: str, print_html: bool, print_meta: bool,
                                   print_data: bool) -> dict:
+    # the work dict of the first parser, with the whole page fetched through the session of the default client; the
+    # parser now runs on the ParserState of retrieve_translation_new_state
+    client: TranslatorClient = get_default_client()
     work: dict = {
         'print_html': print_html,
         'print_meta': print_meta,
@@ -439,246 +1364,622 @@ def retrieve_translation_new_work(from_lang: str, to_lang: str, word: str, print
         'classes': None,
         'data_phs': None,
         'classes_prev': [],
-        'html': requests.get(f"https://www.wordreference.com/{from_lang}{to_lang}/{word}").text
+        'html': client.session.get(client.get_url(from_lang, to_lang, word), timeout=client.timeout).text
     }
     if print_html:
         print(work['html'])
     return work
 
 
-def retrieve_translation_pre_writing(translation: Translation, work: dict):
-    if work['to_example'] and work['last_recognized'] == 'to_example' and len(work['classes_prev']) > 0:
-        if work['print_data']:
-            print(f"    to_example={work['to_example']}")
+def retrieve_translation_new_state(html: str, print_html: bool, print_meta: bool, print_data: bool,
+                                   backend: str = 'python') -> ParserState:
+    work: ParserState = ParserState(html, print_html, print_meta, print_data, backend)
+    if print_html:
+        print(work.html)
+    return work
+
+
+def retrieve_translation_pre_writing(translation: Translation, work: ParserState):
+    if work.to_example and work.last_recognized == 'to_example' and work.class_count > 0:
+        if work.print_data:
+            print(f"    to_example={work.to_example}")
         entry_word: EntryWord = translation.entry_sections[-1].entry_words[-1]
-        entry_word.to_examples.append(work['to_example'])
-        work['to_example'] = ''
-        work['classes_prev'] = []
-
-
-def retrieve_translation_reading_1(work: dict):
-    if 'wrtopsection' in work['classes_prev'] and 'sMainMeanings' in work['data_phs']:
-        work['section_type'] = 'principal_translations'
-    elif 'wrtopsection' in work['classes_prev'] and 'sAddTrans' in work['data_phs']:
-        work['section_type'] = 'additional_translations'
-    elif 'wrtopsection' in work['classes_prev'] and 'sCmpdForms' in work['data_phs']:
-        work['section_type'] = 'compound_forms'
-    elif 'wrtopsection' in work['classes_prev'] and 'sPhrasalVerbs' in work['data_phs']:
-        work['section_type'] = 'phrasal_verbs'
+        entry_word.to_examples.append(work.to_example)
+        work.to_example = ''
+        work.clear_classes()
+
+
+def retrieve_translation_reading_1(work: ParserState):
+    if 'sMainMeanings' in work.data_phs:
+        work.section_type = 'principal_translations'
+    elif 'sAddTrans' in work.data_phs:
+        work.section_type = 'additional_translations'
+    elif 'sCmpdForms' in work.data_phs:
+        work.section_type = 'compound_forms'
+    elif 'sPhrasalVerbs' in work.data_phs:
+        work.section_type = 'phrasal_verbs'
     else:
         return
-    work['penultimate_recognized'] = work['last_recognized']
-    work['last_recognized'] = 'section_type'
+    work.penultimate_recognized = work.last_recognized
+    work.last_recognized = 'section_type'
 
 
-def retrieve_translation_reading_2(work: dict) -> bool:
-    if 'FrWrd' in work['classes_prev'] and 'ph' not in work['classes_prev']:
-        work['from_word'] = work['content']
-        work['to_word'] = ''
-        work['penultimate_recognized'] = 'to_example'
-        work['last_recognized'] = 'from_word'
-        return True
-    elif 'ToWrd' in work['classes_prev'] and 'ph' not in work['classes_prev']:
-        work['from_word'] = ''
-        work['to_word'] = work['content']
-        work['penultimate_recognized'] = work['last_recognized']
-        work['last_recognized'] = 'to_word'
-        return True
-    elif 'FrEx' in work['classes_prev']:
-        work['from_example'] = work['content']
-        work['penultimate_recognized'] = work['last_recognized']
-        work['last_recognized'] = 'from_example'
-        return True
+def retrieve_translation_reading_from_word(work: ParserState) -> bool:
+    work.from_word = work.content
+    work.to_word = ''
+    work.penultimate_recognized = 'to_example'
+    work.last_recognized = 'from_word'
+    return True
+
+
+def retrieve_translation_reading_to_word(work: ParserState) -> bool:
+    work.from_word = ''
+    work.to_word = work.content
+    work.penultimate_recognized = work.last_recognized
+    work.last_recognized = 'to_word'
+    return True
+
+
+def retrieve_translation_reading_from_example(work: ParserState) -> bool:
+    work.from_example = work.content
+    work.penultimate_recognized = work.last_recognized
+    work.last_recognized = 'from_example'
+    return True
+
+
+def retrieve_translation_reading_to_example_tooltip(work: ParserState) -> bool:
+    work.remove_tooltip()
     return False
 
 
-def is_from_grammar_reading(work: dict) -> bool:
-    return 'POS2' in work['classes_prev'] and work['from_word']
+def retrieve_translation_reading_to_example(work: ParserState) -> bool:
+    work.to_example = work.content
+    work.penultimate_recognized = work.last_recognized
+    work.last_recognized = 'to_example'
+    work.clear_classes()
+    return False
+
+
+def is_from_grammar_reading(work: ParserState) -> bool:
+    return work.mask & CONST_CLASS_POS2 and work.from_word
 
 
-def is_content_or_from_grammar_reading(work: dict) -> bool:
-    return work['content'] or is_from_grammar_reading(work)
+def is_content_or_from_grammar_reading(work: ParserState) -> bool:
+    return work.content or is_from_grammar_reading(work)
 
 
-def retrieve_translation_reading_3_a(work: dict) -> bool:
-    if 'Fr2' in work['classes_prev'] and len(work['classes_prev']) == 1:
-        work['tone'] = work['content']
-        work['penultimate_recognized'] = work['last_recognized']
-        work['last_recognized'] = 'tone'
+def retrieve_translation_reading_3_a(work: ParserState) -> bool:
+    if work.mask & CONST_CLASS_FR2 and work.class_count == 1:
+        work.tone = work.content
+        work.penultimate_recognized = work.last_recognized
+        work.last_recognized = 'tone'
         return True
     elif is_from_grammar_reading(work):
-        work['from_grammar'] = work['content']
-        work['from_grammar'] = '' if work['from_grammar'] is None else work['from_grammar']
-        work['from_grammar_found'] = True
-        work['penultimate_recognized'] = work['last_recognized']
-        work['last_recognized'] = 'from_grammar'
+        work.from_grammar = work.content
+        work.from_grammar = '' if work.from_grammar is None else work.from_grammar
+        work.from_grammar_found = True
+        work.penultimate_recognized = work.last_recognized
+        work.last_recognized = 'from_grammar'
         return True
-    elif 'POS2' in work['classes_prev'] and work['to_word']:
-        work['to_grammar'] = work['content']
-        work['penultimate_recognized'] = work['last_recognized']
-        work['last_recognized'] = 'to_grammar'
+    elif work.mask & CONST_CLASS_POS2 and work.to_word:
+        work.to_grammar = work.content
+        work.penultimate_recognized = work.last_recognized
+        work.last_recognized = 'to_grammar'
         return True
-    elif 'dsense' in work['classes_prev']:
-        work['note'] = work['content']
-        work['penultimate_recognized'] = work['last_recognized']
-        work['last_recognized'] = 'note'
+    elif work.mask & CONST_CLASS_DSENSE:
+        work.note = work.content
+        work.penultimate_recognized = work.last_recognized
+        work.last_recognized = 'note'
         return True
     return False
 
 
-def retrieve_translation_reading_3_b(work: dict):
-    if work['note'] and len(work['classes_prev']) == 0:
-        work['note'] += work['content']
-        work['penultimate_recognized'] = work['last_recognized']
-        work['last_recognized'] = 'note'
-    elif work['from_word'] and len(work['classes_prev']) == 0:
-        work['from_word'] += ' ' + work['content']
-        work['penultimate_recognized'] = work['last_recognized']
-        work['last_recognized'] = 'from_word'
-    elif (work['last_recognized'] == 'from_grammar' and work['penultimate_recognized'] == 'from_word' or
-          work['last_recognized'] == 'tone' and work['penultimate_recognized'] == 'from_grammar') \
-            and len(work['classes_prev']) == 0:
-        work['context'] = work['content']
-        if work['context'][:1] != '(' and '(' in work['context'] and work['context'][-1:] == ')':
-            work['tone'] = work['context'][:work['context'].index('(')].strip()
-            work['context'] = work['context'][work['context'].index('('):]
-        if ')(' in work['context'] and work['context'][:1] == '(' and work['context'][-1:] == ')':
-            work['note'] = work['context'][work['context'].index(')(') + 1:]
-            work['context'] = work['context'][:work['context'].index(')(') + 1]
-        work['penultimate_recognized'] = work['last_recognized']
-        work['last_recognized'] = 'context'
-
-
-def retrieve_translation_reading_3(work: dict):
+def retrieve_translation_reading_3_b(work: ParserState):
+    if work.note and work.class_count == 0:
+        work.note += work.content
+        work.penultimate_recognized = work.last_recognized
+        work.last_recognized = 'note'
+    elif work.from_word and work.class_count == 0:
+        work.from_word += ' ' + work.content
+        work.penultimate_recognized = work.last_recognized
+        work.last_recognized = 'from_word'
+    elif (work.last_recognized == 'from_grammar' and work.penultimate_recognized == 'from_word' or
+          work.last_recognized == 'tone' and work.penultimate_recognized == 'from_grammar') \
+            and work.class_count == 0:
+        work.context = work.content
+        if work.context[:1] != '(' and '(' in work.context and work.context[-1:] == ')':
+            work.tone = work.context[:work.context.index('(')].strip()
+            work.context = work.context[work.context.index('('):]
+        if ')(' in work.context and work.context[:1] == '(' and work.context[-1:] == ')':
+            work.note = work.context[work.context.index(')(') + 1:]
+            work.context = work.context[:work.context.index(')(') + 1]
+        work.penultimate_recognized = work.last_recognized
+        work.last_recognized = 'context'
+
+
+def retrieve_translation_reading_3(work: ParserState) -> bool:
+    if work.to_example and work.last_recognized == 'to_example' and work.class_count == 0:
+        work.to_example += '' if work.to_example[-1:] == '(' else ' '
+        work.to_example += work.content
+        # work.penultimate_recognized eq work.last_recognized
+        # work.last_recognized eq 'to_example'
+        work.clear_classes()
+        return False
     if not retrieve_translation_reading_3_a(work):
         retrieve_translation_reading_3_b(work)
+    return True
 
 
-def retrieve_translation_reading(work: dict) -> bool:
-    retrieve_translation_reading_1(work)
-    if retrieve_translation_reading_2(work):
-        return True
-    if 'ToEx' in work['classes_prev'] and 'tooltip' in work['classes_prev']:
-        work['classes_prev'].remove('tooltip')
-        # work['classes_prev'] eq []
-        work['html'], work['classes'], work['data_phs'], work['content'] = next_tag_content(work['html'])
-        return False
-    elif 'ToEx' in work['classes_prev']:
-        work['to_example'] = work['content']
-        work['penultimate_recognized'] = work['last_recognized']
-        work['last_recognized'] = 'to_example'
-        work['classes_prev'] = []
-        work['html'], work['classes'], work['data_phs'], work['content'] = next_tag_content(work['html'])
-        return False
-    elif work['to_example'] and work['last_recognized'] == 'to_example' and len(work['classes_prev']) == 0:
-        work['to_example'] += '' if work['to_example'][-1:] == '(' else ' '
-        work['to_example'] += work['content']
-        # work['penultimate_recognized'] eq work['last_recognized']
-        # work['last_recognized'] eq 'to_example'
-        work['classes_prev'] = []
-        work['html'], work['classes'], work['data_phs'], work['content'] = next_tag_content(work['html'])
-        return False
-    retrieve_translation_reading_3(work)
-    return True
+def select_translation_reading(mask: int):
+    # the reading a mask leads to, in the order the class checks were made on classes_prev
+    if mask & CONST_CLASS_FR_WRD and not mask & CONST_CLASS_PH:
+        return retrieve_translation_reading_from_word
+    elif mask & CONST_CLASS_TO_WRD and not mask & CONST_CLASS_PH:
+        return retrieve_translation_reading_to_word
+    elif mask & CONST_CLASS_FR_EX:
+        return retrieve_translation_reading_from_example
+    elif mask & CONST_CLASS_TO_EX and mask & CONST_CLASS_TOOLTIP:
+        return retrieve_translation_reading_to_example_tooltip
+    elif mask & CONST_CLASS_TO_EX:
+        return retrieve_translation_reading_to_example
+    return retrieve_translation_reading_3
+
+
+# indexed by mask; a reading returns whether the tag leads to writing
+CONST_TRANSLATION_READINGS = [select_translation_reading(mask) for mask in range(1 << len(CONST_CLASS_BITS))]
 
 
-def retrieve_translation_writing_1(translation: Translation, work: dict):
-    if work['section_type']:
-        if work['print_data']:
-            print(f"    section_type={work['section_type']}")
-        entry_section: EntrySection = EntrySection(section_type=work['section_type'], entry_words=[])
+def retrieve_translation_reading(work: ParserState) -> bool:
+    if work.mask & CONST_CLASS_WRTOPSECTION:
+        retrieve_translation_reading_1(work)
+    return CONST_TRANSLATION_READINGS[work.mask](work)
+
+
+def retrieve_translation_writing_1(translation: Translation, work: ParserState):
+    if work.section_type:
+        if work.print_data:
+            print(f"    section_type={work.section_type}")
+        entry_section: EntrySection = EntrySection(section_type=work.section_type, entry_words=[])
         translation.entry_sections.append(entry_section)
-        work['section_type'] = ''
-    if work['tone']:
-        if work['print_data']:
-            print(f"    tone={work['tone']}")
+        work.section_type = ''
+    if work.tone:
+        if work.print_data:
+            print(f"    tone={work.tone}")
         entry_word: EntryWord = translation.entry_sections[-1].entry_words[-1]
-        entry_word.tone = work['tone']
-        work['tone'] = ''
-    if work['context']:
-        work['context'] = work['context'][1:-1]
-        if work['print_data']:
-            print(f"    context={work['context']}")
+        entry_word.tone = sys.intern(work.tone)
+        work.tone = ''
+    if work.context:
+        work.context = work.context[1:-1]
+        if work.print_data:
+            print(f"    context={work.context}")
         entry_word: EntryWord = translation.entry_sections[-1].entry_words[-1]
-        entry_word.context = work['context']
-        work['context'] = ''
-    if work['from_example']:
-        if work['print_data']:
-            print(f"    from_example={work['from_example']}")
+        entry_word.context = work.context
+        work.context = ''
+    if work.from_example:
+        if work.print_data:
+            print(f"    from_example={work.from_example}")
         if not len(translation.entry_sections[-1].entry_words):
-            print(f"from_example={work['from_example']}")
+            print(f"from_example={work.from_example}")
         entry_word: EntryWord = translation.entry_sections[-1].entry_words[-1]
-        entry_word.from_examples.append(work['from_example'])
-        work['from_example'] = ''
+        entry_word.from_examples.append(work.from_example)
+        work.from_example = ''
 
 
-def new_entry_word(translation: Translation, work: dict):
-    from_word_2: FromWord = FromWord(from_word=work['from_word'], from_grammar=work['from_grammar'])
+def new_entry_word(translation: Translation, work: ParserState):
+    from_word_2: FromWord = FromWord(from_word=work.from_word, from_grammar=work.from_grammar)
     entry_word: EntryWord = EntryWord(from_word=from_word_2, to_words=[], tone='', context='',
                                       from_examples=[], to_examples=[])
     translation.entry_sections[-1].entry_words.append(entry_word)
-    work['from_word'] = ''
-    work['from_grammar'] = ''
-    work['from_grammar_found'] = False
+    work.from_word = ''
+    work.from_grammar = ''
+    work.from_grammar_found = False
 
 
-def retrieve_translation_writing_2(translation: Translation, work: dict):
-    if work['from_grammar_found'] and work['from_word']:
-        if work['print_data']:
-            print(f"    from_word={work['from_word']}")
-            print(f"    from_grammar={work['from_grammar']}")
+def retrieve_translation_writing_2(translation: Translation, work: ParserState):
+    if work.from_grammar_found and work.from_word:
+        if work.print_data:
+            print(f"    from_word={work.from_word}")
+            print(f"    from_grammar={work.from_grammar}")
         new_entry_word(translation, work)
-    if work['to_grammar'] and work['to_word']:
-        if work['note']:
-            work['note'] = work['note'][1:-1]
-        if work['print_data']:
-            if work['note']:
-                print(f"    note={work['note']}")
-            print(f"    to_word={work['to_word']}")
-            print(f"    to_grammar={work['to_grammar']}")
+    if work.to_grammar and work.to_word:
+        if work.note:
+            work.note = work.note[1:-1]
+        if work.print_data:
+            if work.note:
+                print(f"    note={work.note}")
+            print(f"    to_word={work.to_word}")
+            print(f"    to_grammar={work.to_grammar}")
         last_entry_section: EntrySection = translation.entry_sections[-1]
         entry_word: EntryWord = last_entry_section.entry_words[-1]
-        to_word_2: ToWord = ToWord(to_word=work['to_word'], to_grammar=work['to_grammar'], note=work['note'])
+        to_word_2: ToWord = ToWord(to_word=work.to_word, to_grammar=work.to_grammar, note=work.note)
         entry_word.to_words.append(to_word_2)
-        work['to_word'] = ''
-        work['to_grammar'] = ''
-        work['note'] = ''
-    work['classes_prev'] = []
+        work.to_word = ''
+        work.to_grammar = ''
+        work.note = ''
+    work.clear_classes()
 
 
-def retrieve_translation_writing(translation: Translation, work: dict):
+def next_work_tag(work: ParserState) -> bool:
+    tag_content = next(work.tags, None)
+    if tag_content is None:
+        return False
+    work.classes, work.data_phs, work.content = tag_content
+    return True
+
+
+def retrieve_translation_writing(translation: Translation, work: ParserState):
     retrieve_translation_writing_1(translation, work)
     retrieve_translation_writing_2(translation, work)
 
 
-def retrieve_translation(from_lang: str, to_lang: str, word: str, print_html: bool = False, print_meta: bool = False,
-                         print_data: bool = False) -> Translation:
-    translation: Translation = Translation(from_lang=from_lang, to_lang=to_lang, from_word=word, entry_sections=[])
-    work: dict = retrieve_translation_new_work(from_lang, to_lang, word, print_html, print_meta, print_data)
-    work['html'] = clean_html(work['html'])
-    work['html'], work['classes'], work['data_phs'], work['content'] = next_tag_content(work['html'])
-    while work['html']:
+def iter_translation_parse(translation: Translation, work: ParserState):
+    # fills translation like retrieve_translation_parse and yields (entry_section, entry_word) as soon as the parser
+    # moves past that entry word, then (entry_section, None) once the whole section is done
+    if metrics_hooks:
+        yield from iter_translation_parse_measured(translation, work)
+        return
+    work.html = clean_html(work.html)
+    work.tags = work.iter_tag_contents(work.html)
+    yield from iter_translation_tags(translation, work)
+
+
+class MeasuredTags:
+    # an iterator over tags timing and counting them as they are read, so the tokenizing is measured on its own
+    # without reading the tags ahead of the parser
+    __slots__ = ('tags', 'seconds', 'count')
+
+    def __init__(self, tags):
+        self.tags = tags
+        self.seconds: float = 0.0
+        self.count: int = 0
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        start: float = time.perf_counter()
+        try:
+            tag = next(self.tags)
+        finally:
+            self.seconds += time.perf_counter() - start
+        self.count += 1
+        return tag
+
+
+def iter_translation_parse_measured(translation: Translation, work: ParserState):
+    # iter_translation_parse for the metrics hooks: the tags are timed as the parser reads them, so parse_seconds
+    # leaves out the tokenizing, and the time the caller takes between two yields is not counted in either
+    entry_section: EntrySection
+    start: float = time.perf_counter()
+    html: str = clean_html(work.html)
+    emit_metrics(clean_html_seconds=time.perf_counter() - start, html_chars=len(work.html))
+    work.html = html
+    tags: MeasuredTags = MeasuredTags(iter(work.iter_tag_contents(html)))
+    work.tags = tags
+    seconds: float = 0.0
+    start = time.perf_counter()
+    try:
+        for item in iter_translation_tags(translation, work):
+            seconds += time.perf_counter() - start
+            yield item
+            start = time.perf_counter()
+        seconds += time.perf_counter() - start
+    finally:
+        # also when the caller stops early, with what was read and parsed until then
+        emit_metrics(tokenize_seconds=tags.seconds, tags=tags.count, parse_seconds=seconds - tags.seconds,
+                     entry_sections=len(translation.entry_sections),
+                     entry_words=sum(len(entry_section.entry_words) for entry_section in translation.entry_sections))
+
+
+def iter_translation_tags(translation: Translation, work: ParserState):
+    # the state machine alone, over the (classes, data_phs, content) iterator in work.tags
+    entry_sections: [EntrySection] = translation.entry_sections
+    section_count: int = 0
+    word_count: int = 0
+    while next_work_tag(work):
         retrieve_translation_pre_writing(translation, work)
-        if len(work['classes']) > 0:
-            work['classes_prev'].extend(work['classes'])
+        if work.classes:
+            work.extend_classes(work.classes)
         if is_content_or_from_grammar_reading(work):
-            if print_meta:
-                print(f"""classes_prev="{work['classes_prev']}" """)
-                print(f"""data_phs="{work['data_phs']}" """)
-                print(f"""content="{work['content']}" """)
+            if work.print_meta:
+                print(f"""classes_prev="{work.classes_prev}" """)
+                print(f"""data_phs="{work.data_phs}" """)
+                print(f"""content="{work.content}" """)
             if not retrieve_translation_reading(work):
                 continue
             retrieve_translation_writing(translation, work)
-        work['html'], work['classes'], work['data_phs'], work['content'] = next_tag_content(work['html'])
-    if work['classes'] and len(work['classes']) > 0:
-        work['classes_prev'].extend(work['classes'])
-    if work['content'] and print_meta:
-        print(f"""classes_prev_last="{work['classes_prev']}" """)
-        print(f"""data_phs_last="{work['data_phs']}" """)
-        print(f"""content_last="{work['content']}" """)
+            if len(entry_sections) != section_count:
+                if section_count > 0:
+                    if word_count > 0:
+                        yield entry_sections[section_count - 1], entry_sections[section_count - 1].entry_words[-1]
+                    yield entry_sections[section_count - 1], None
+                section_count = len(entry_sections)
+                word_count = 0
+            if section_count > 0 and len(entry_sections[-1].entry_words) != word_count:
+                if word_count > 0:
+                    yield entry_sections[-1], entry_sections[-1].entry_words[word_count - 1]
+                word_count = len(entry_sections[-1].entry_words)
+    if section_count > 0:
+        if word_count > 0:
+            yield entry_sections[-1], entry_sections[-1].entry_words[-1]
+        yield entry_sections[-1], None
+
+
+def retrieve_translation_parse(translation: Translation, work: ParserState) -> Translation:
+    for _ in iter_translation_parse(translation, work):
+        pass
     return translation
 
 
+def parse_translation_html(html: str | bytes, from_lang: str, to_lang: str, word: str, print_html: bool = False,
+                           print_meta: bool = False, print_data: bool = False, backend: str = 'python') -> Translation:
+    # no I/O: html is a page as fetched from wordreference (or its trim_html part), bytes are read as UTF-8
+    if isinstance(html, bytes):
+        html = html.decode('utf-8')
+    translation: Translation = Translation(from_lang=from_lang, to_lang=to_lang, from_word=word, entry_sections=[])
+    return retrieve_translation_parse(translation, retrieve_translation_new_state(html, print_html, print_meta,
+                                                                                   print_data, backend))
+
+
+def iter_parsed_entries(html: str | bytes, from_lang: str, to_lang: str, word: str, backend: str = 'python'):
+    if isinstance(html, bytes):
+        html = html.decode('utf-8')
+    translation: Translation = Translation(from_lang=from_lang, to_lang=to_lang, from_word=word, entry_sections=[])
+    yield from iter_translation_parse(translation, retrieve_translation_new_state(html, False, False, False, backend))
+
+
+def iter_entry_sections(html: str | bytes, from_lang: str, to_lang: str, word: str, backend: str = 'python'):
+    # each EntrySection is yielded once complete; stopping early skips parsing the rest of the page
+    for entry_section, entry_word in iter_parsed_entries(html, from_lang, to_lang, word, backend):
+        if entry_word is None:
+            yield entry_section
+
+
+def iter_entry_words(html: str | bytes, from_lang: str, to_lang: str, word: str, backend: str = 'python'):
+    # (entry_section, entry_word) pairs, each yielded once the entry word is complete
+    for entry_section, entry_word in iter_parsed_entries(html, from_lang, to_lang, word, backend):
+        if entry_word is not None:
+            yield entry_section, entry_word
+
+
+def compare_parser_backends(pages, backends=None) -> dict:
+    # parses every page with each backend, python first as the reference; for each backend, the seconds it took and
+    # the indexes of the pages whose Translation differs from the python one
+    names: [str] = ['python'] + [name for name in backends or parser_backends if name != 'python']
+    htmls: [str] = [html.decode('utf-8') if isinstance(html, bytes) else html for html in pages]
+    reference: [str] = []
+    results: dict = {}
+    for name in names:
+        start: float = time.perf_counter()
+        translations: [Translation] = [parse_translation_html(html, '', '', '', backend=name) for html in htmls]
+        seconds: float = time.perf_counter() - start
+        encoded: [str] = [translation.to_json_encoded(None) for translation in translations]
+        reference = reference or encoded
+        results[name] = {'seconds': seconds,
+                         'mismatches': [ind for ind in range(len(encoded)) if encoded[ind] != reference[ind]]}
+    return results
+
+
+def select_parser_backend(pages, backends=None) -> str:
+    # the fastest backend giving the same translations as python on pages
+    results: dict = compare_parser_backends(pages, backends)
+    return min((result['seconds'], name) for name, result in results.items() if not result['mismatches'])[1]
+
+
+class TranslatorClient:
+    def __init__(self, base_url: str = CONST_BASE_URL, connect_timeout: float = 5.0, read_timeout: float = 30.0,
+                 max_retries: int = 3, backoff_factor: float = 0.5, pool_connections: int = 10,
+                 pool_maxsize: int = 10, html_cache=None, translation_cache=None, early_cutoff: bool = True,
+                 packs=(), parser_backend: str = 'python'):
+        self.base_url: str = base_url.rstrip('/')
+        # a name from parser_backends, see compare_parser_backends and select_parser_backend
+        self.parser_backend: str = parser_backend
+        get_parser_backend(parser_backend)
+        # TranslationPacks from translation_pack, looked up before anything else for their lang pair
+        self.packs: dict = {(pack.from_lang, pack.to_lang): pack for pack in packs}
+        # stop downloading once the collinsdiv marker is read, at the cost of not reusing that connection
+        self.early_cutoff: bool = early_cutoff
+        # an HtmlCache from translation_cache, or None to always go to the network
+        self.html_cache = html_cache
+        # a TranslationCache from translation_cache, or None to parse every page
+        self.translation_cache = translation_cache
+        self.timeout: (float, float) = (connect_timeout, read_timeout)
+        self.max_retries: int = max_retries
+        self.backoff_factor: float = backoff_factor
+        self.pool_connections: int = pool_connections
+        retry: Retry = Retry(total=max_retries, backoff_factor=backoff_factor,
+                             status_forcelist=(429, 500, 502, 503, 504), allowed_methods=frozenset(['GET']))
+        adapter: HTTPAdapter = HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize,
+                                           max_retries=retry)
+        self.session: requests.Session = requests.Session()
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+    def get_url(self, from_lang: str, to_lang: str, word: str) -> str:
+        return f"{self.base_url}/{from_lang}{to_lang}/{word}"
+
+    def copy_with_pool(self, pool_maxsize: int) -> 'TranslatorClient':
+        # the same settings, packs and caches, with a session of its own holding up to pool_maxsize connections
+        return TranslatorClient(self.base_url, self.timeout[0], self.timeout[1], self.max_retries, self.backoff_factor,
+                                self.pool_connections, pool_maxsize, self.html_cache, self.translation_cache,
+                                self.early_cutoff, self.packs.values(), self.parser_backend)
+
+    def fetch_page(self, from_lang: str, to_lang: str, word: str) -> str:
+        # the whole page, as the site serves it
+        start: float = time.perf_counter()
+        response: requests.Response = self.session.get(self.get_url(from_lang, to_lang, word), timeout=self.timeout)
+        response.raise_for_status()
+        if metrics_hooks:
+            emit_metrics(fetch_seconds=time.perf_counter() - start, fetch_bytes=len(response.content))
+        return response.text
+
+    def fetch_html(self, from_lang: str, to_lang: str, word: str) -> str:
+        if not self.early_cutoff:
+            return self.fetch_page(from_lang, to_lang, word)
+        start: float = time.perf_counter()
+        with self.session.get(self.get_url(from_lang, to_lang, word), timeout=self.timeout, stream=True) as response:
+            response.raise_for_status()
+            trimmer: HtmlTrimmer = HtmlTrimmer()
+            decoder: codecs.IncrementalDecoder = codecs.getincrementaldecoder(response.encoding or 'utf-8')('replace')
+            size: int = 0
+            for chunk in response.iter_content(CONST_CHUNK_SIZE):
+                size += len(chunk)
+                if trimmer.feed(decoder.decode(chunk)):
+                    break
+            else:
+                trimmer.feed(decoder.decode(b'', True))
+            if metrics_hooks:
+                emit_metrics(fetch_seconds=time.perf_counter() - start, fetch_bytes=size)
+            return trimmer.get_html()
+
+    def get_html(self, from_lang: str, to_lang: str, word: str) -> str:
+        if self.html_cache is None:
+            return self.fetch_html(from_lang, to_lang, word)
+        html: str | None = self.html_cache.get(from_lang, to_lang, word)
+        if html is None:
+            html = self.fetch_html(from_lang, to_lang, word)
+            self.html_cache.put(from_lang, to_lang, word, html)
+        return html
+
+    def get_stored_translation(self, from_lang: str, to_lang: str, word: str) -> Translation | None:
+        pack = self.packs.get((from_lang, to_lang))
+        if pack is not None:
+            translation: Translation | None = pack.get(word)
+            if translation is not None:
+                return translation
+        if self.translation_cache is not None:
+            return self.translation_cache.get(from_lang, to_lang, word)
+        return None
+
+    def retrieve_translation(self, from_lang: str, to_lang: str, word: str, print_html: bool = False,
+                             print_meta: bool = False, print_data: bool = False) -> Translation:
+        if print_html:
+            # the page is printed as downloaded, so it is fetched whole, without the packs and the caches
+            return parse_translation_html(self.fetch_page(from_lang, to_lang, word), from_lang, to_lang, word,
+                                          print_html, print_meta, print_data, self.parser_backend)
+        translation: Translation | None = self.get_stored_translation(from_lang, to_lang, word)
+        if translation is not None:
+            return translation
+        translation = parse_translation_html(self.get_html(from_lang, to_lang, word), from_lang, to_lang, word,
+                                             print_html, print_meta, print_data, self.parser_backend)
+        if self.translation_cache is not None:
+            self.translation_cache.put(from_lang, to_lang, word, translation)
+        return translation
+
+    def iter_entry_sections(self, from_lang: str, to_lang: str, word: str):
+        translation: Translation | None = self.get_stored_translation(from_lang, to_lang, word)
+        if translation is not None:
+            yield from translation.entry_sections
+            return
+        yield from iter_entry_sections(self.get_html(from_lang, to_lang, word), from_lang, to_lang, word,
+                                       self.parser_backend)
+
+    def iter_entry_words(self, from_lang: str, to_lang: str, word: str):
+        entry_section: EntrySection
+        translation: Translation | None = self.get_stored_translation(from_lang, to_lang, word)
+        if translation is not None:
+            for entry_section in translation.entry_sections:
+                for entry_word in entry_section.entry_words:
+                    yield entry_section, entry_word
+            return
+        yield from iter_entry_words(self.get_html(from_lang, to_lang, word), from_lang, to_lang, word,
+                                    self.parser_backend)
+
+    def close(self):
+        self.session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+default_client: TranslatorClient | None = None
+default_client_lock: threading.Lock = threading.Lock()
+
+
+def get_default_client() -> TranslatorClient:
+    global default_client
+    with default_client_lock:
+        if default_client is None:
+            default_client = TranslatorClient()
+        return default_client
+
+
+def set_default_client(client: TranslatorClient):
+    global default_client
+    with default_client_lock:
+        default_client = client
+
+
+def retrieve_translation(from_lang: str, to_lang: str, word: str, print_html: bool = False, print_meta: bool = False,
+                         print_data: bool = False) -> Translation:
+    return get_default_client().retrieve_translation(from_lang, to_lang, word, print_html, print_meta, print_data)
+
+
+class TranslationResult:
+    def __init__(self, from_lang: str, to_lang: str, word: str, translation: Translation | None,
+                 error: Exception | None):
+        self.from_lang: str = from_lang
+        self.to_lang: str = to_lang
+        self.word: str = word
+        self.translation: Translation | None = translation
+        self.error: Exception | None = error
+
+
+def to_lookup(item: str | tuple, from_lang: str | None, to_lang: str | None) -> (str, str, str):
+    if isinstance(item, str):
+        if from_lang is None or to_lang is None:
+            raise ValueError(f'from_lang and to_lang are required to translate the word "{item}"')
+        return from_lang, to_lang, item
+    item_from_lang, item_to_lang, word = item
+    return item_from_lang, item_to_lang, word
+
+
+def retrieve_translation_result(client: TranslatorClient, from_lang: str, to_lang: str,
+                                word: str) -> TranslationResult:
+    try:
+        translation: Translation = client.retrieve_translation(from_lang, to_lang, word)
+    except Exception as error:
+        return TranslationResult(from_lang, to_lang, word, None, error)
+    return TranslationResult(from_lang, to_lang, word, translation, None)
+
+
+def pop_translation_results(pending: deque, ordered: bool):
+    future: Future
+    if ordered:
+        yield pending.popleft().result()
+        return
+    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+    for future in done:
+        pending.remove(future)
+        yield future.result()
+
+
+def retrieve_translations(words, from_lang: str | None = None, to_lang: str | None = None, workers: int = 8,
+                          ordered: bool = True, client: TranslatorClient | None = None):
+    # words holds plain words (with from_lang and to_lang) or (from_lang, to_lang, word) triples; at most twice
+    # workers lookups are in flight, so the input can be a lazy iterable of any length. Without a client, the default
+    # client's settings, packs and caches are used, on a session sized for workers
+    own_client: bool = client is None
+    client = get_default_client().copy_with_pool(workers) if own_client else client
+    executor: ThreadPoolExecutor = ThreadPoolExecutor(max_workers=workers)
+    pending: deque = deque()
+    max_pending: int = workers * 2
+    try:
+        for item in words:
+            pending.append(executor.submit(retrieve_translation_result, client, *to_lookup(item, from_lang, to_lang)))
+            if len(pending) >= max_pending:
+                yield from pop_translation_results(pending, ordered)
+        while pending:
+            yield from pop_translation_results(pending, ordered)
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
+        if own_client:
+            client.close()
+
+
 def example_1_for_encoded_object():
     translation: Translation = retrieve_translation(from_lang='es', to_lang='en', word='casa')
     print(translation.entry_sections[0].entry_words[0].from_examples[1])